@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Startup-time budget check for the hook scripts.
+
+Imports each script in a fresh interpreter under ``python -X importtime`` and
+compares the median cumulative import time against a budget. Exits 1 when a
+script goes over budget, so CI catches a heavy import slipping back into the
+hook path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Sequence
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Median cumulative import time in milliseconds, with headroom for slow CI
+# runners. Measured at roughly 55, 10 and 3 ms on a developer laptop.
+BUDGETS_MS = {
+    "precommit_safety_gate": 150.0,
+    "validate_conventional_commit": 60.0,
+    "commit_hook_runner": 30.0,
+}
+
+
+def import_time_ms(module: str) -> float:
+    """Return the cumulative ``-X importtime`` figure for ``module``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SCRIPTS_DIR,
+        text=True,
+        capture_output=True,
+        check=True,
+    )
+    for line in reversed(result.stderr.splitlines()):
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1000
+    raise RuntimeError(f"no import time reported for {module}")
+
+
+def help_wall_ms(module: str) -> float:
+    """Wall time of ``python <script>.py --help``, interpreter start included."""
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, os.path.join(SCRIPTS_DIR, f"{module}.py"), "--help"],
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+    return (time.perf_counter() - started) * 1000
+
+
+def bench_startup(module: str, budget_ms: float, repeat: int) -> dict[str, object]:
+    # Warm-up run so every measured run reads cached bytecode for imports.
+    import_time_ms(module)
+    imports = [import_time_ms(module) for _ in range(repeat)]
+    walls = [help_wall_ms(module) for _ in range(repeat)]
+    median = statistics.median(imports)
+    return {
+        "benchmark": "startup",
+        "module": module,
+        "import_ms": round(median, 2),
+        "budget_ms": budget_ms,
+        "help_wall_ms": round(statistics.median(walls), 2),
+        "within_budget": median <= budget_ms,
+    }
+
+
+def parse_budget(value: str) -> tuple[str, float]:
+    module, sep, ms = value.partition("=")
+    if not sep or module not in BUDGETS_MS:
+        raise argparse.ArgumentTypeError(
+            f"expected MODULE=MS with MODULE in {sorted(BUDGETS_MS)}"
+        )
+    try:
+        return module, float(ms)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid budget: {ms!r}") from exc
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Check hook script import time against a budget."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per script (default: 5)."
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=parse_budget,
+        action="append",
+        default=[],
+        metavar="MODULE=MS",
+        help="Override a script's import budget in milliseconds.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    budgets = {**BUDGETS_MS, **dict(args.budget_ms)}
+    results = [
+        bench_startup(module, budget, args.repeat) for module, budget in budgets.items()
+    ]
+    print(json.dumps(results, indent=2))
+    return 0 if all(result["within_budget"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
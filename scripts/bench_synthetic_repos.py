@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""Benchmark the safety gate end to end against generated throwaway repos.
+
+Each shape builds a fresh local git repository with staged changes, then
+times the gate's phases one by one and the full ``main()`` pipeline. Results
+are printed (or written) as JSON so runs on different commits can be
+compared. Everything runs offline; only ``git`` is required.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+
+import precommit_safety_gate as gate
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SHAPES = ("small-files", "minified", "binary", "vendor", "renames")
+
+# Keep generated repos independent of the user's git configuration and hooks.
+GIT_ENV = {
+    "GIT_CONFIG_NOSYSTEM": "1",
+    "GIT_CONFIG_GLOBAL": os.devnull,
+    "GIT_AUTHOR_NAME": "Bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_NAME": "Bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.com",
+}
+
+SOURCE_TEMPLATE = """\
+def handler_{n}(request):
+    value = request.get("field_{n}", {n})
+    if value > {limit}:
+        return {{"status": "large", "value": value}}
+    return {{"status": "ok", "value": value}}
+"""
+MINIFIED_TOKENS = (
+    "function(e,t){return e+t}",
+    "var a=document.getElementById('root');",
+    "if(n&&n.length>0){for(var i=0;i<n.length;i++)r.push(n[i])}",
+    "module.exports={render:o,mount:u,version:'1.0.0'};",
+    "t.prototype.keyDown=function(e){this.state.pressed=e.key};",
+    "window.addEventListener('load',function(){init()});",
+)
+
+
+def git(repo: str, *args: str) -> None:
+    subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        env={**os.environ, **GIT_ENV},
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def write_file(path: str, data: str | bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    mode = "wb" if isinstance(data, bytes) else "w"
+    with open(path, mode) as handle:
+        handle.write(data)
+
+
+def make_small_files(repo: str, args: argparse.Namespace, rng: random.Random) -> None:
+    for n in range(args.small_files):
+        name = os.path.join(repo, "src", f"pkg{n % 100}", f"module_{n}.py")
+        write_file(name, SOURCE_TEMPLATE.format(n=n, limit=rng.randint(1, 999)))
+
+
+def make_minified(repo: str, args: argparse.Namespace, rng: random.Random) -> None:
+    """Write a bundle of ``--minified-mb`` MB, one line unless a line size is set."""
+    block = "".join(rng.choice(MINIFIED_TOKENS) for _ in range(2048)).encode()
+    line_bytes = args.minified_line_kb * 1024
+    remaining = args.minified_mb * 1024 * 1024
+    path = os.path.join(repo, "dist", "bundle.min.js")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    column = 0
+    with open(path, "wb") as handle:
+        while remaining > 0:
+            chunk = block[:remaining]
+            remaining -= len(chunk)
+            while line_bytes and column + len(chunk) >= line_bytes:
+                split = line_bytes - column
+                handle.write(chunk[:split] + b"\n")
+                chunk, column = chunk[split:], 0
+            handle.write(chunk)
+            column += len(chunk)
+        handle.write(b"\n")
+
+
+def make_binary(repo: str, args: argparse.Namespace, rng: random.Random) -> None:
+    per_file = max(1, args.binary_mb * 1024 * 1024 // max(1, args.binary_files))
+    for n in range(args.binary_files):
+        write_file(
+            os.path.join(repo, "assets", f"blob_{n}.bin"), rng.randbytes(per_file)
+        )
+
+
+def make_vendor(repo: str, args: argparse.Namespace, rng: random.Random) -> None:
+    """Build ``--vendor-packages`` packages, each ``--vendor-depth`` levels deep."""
+    for package in range(args.vendor_packages):
+        directory = os.path.join(repo, "vendor", f"package_{package}")
+        for level in range(args.vendor_depth):
+            directory = os.path.join(directory, f"level_{level}")
+            body = SOURCE_TEMPLATE.format(n=level, limit=rng.randint(1, 999))
+            write_file(os.path.join(directory, "index.py"), body)
+
+
+def make_renames(repo: str, args: argparse.Namespace, rng: random.Random) -> None:
+    """Commit ``--renames`` files, then stage a move of every one of them."""
+    for n in range(args.renames):
+        body = SOURCE_TEMPLATE.format(n=n, limit=rng.randint(1, 999))
+        write_file(os.path.join(repo, "old", f"file_{n}.py"), body)
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "seed")
+    os.rename(os.path.join(repo, "old"), os.path.join(repo, "new"))
+
+
+BUILDERS: dict[str, Callable[[str, argparse.Namespace, random.Random], None]] = {
+    "small-files": make_small_files,
+    "minified": make_minified,
+    "binary": make_binary,
+    "vendor": make_vendor,
+    "renames": make_renames,
+}
+
+
+def build_repo(shape: str, args: argparse.Namespace) -> str:
+    repo = tempfile.mkdtemp(prefix=f"gate-bench-{shape}-")
+    git(repo, "init", "-q", "-b", "bench/synthetic")
+    BUILDERS[shape](repo, args, random.Random(args.seed))
+    git(repo, "add", "-A")
+    return repo
+
+
+@contextmanager
+def inside(repo: str) -> Iterator[None]:
+    saved_cwd, saved_env = os.getcwd(), dict(os.environ)
+    os.chdir(repo)
+    os.environ.update(GIT_ENV)
+    try:
+        yield
+    finally:
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+
+def timed(func: Callable[[], object]) -> tuple[float, object]:
+    started = time.perf_counter()
+    value = func()
+    return time.perf_counter() - started, value
+
+
+def run_main(argv: list[str]) -> int:
+    with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+        return gate.main(argv)
+
+
+def measure_once(jobs: int) -> dict[str, float | int]:
+    """Time each gate phase in the current repo, then ``main()`` cold and warm."""
+    phases: dict[str, float | int] = {}
+    phases["branch"], branch = timed(
+        lambda: gate.run_git(["branch", "--show-current"]).stdout.strip()
+    )
+    phases["read_staged_diff"], staged = timed(
+        lambda: gate.read_staged_diff(scan_sensitive=True, jobs=jobs, cache=None)
+    )
+    phases["file_sizes"], sizes = timed(
+        lambda: gate.diff_file_sizes(staged.raw_entries)
+    )
+    phases["evaluate"], _ = timed(
+        lambda: gate.evaluate_findings(
+            branch=branch,
+            staged_paths=staged.staged_paths,
+            staged_has_changes=bool(staged.raw_entries),
+            content_scan=staged.content_scan,
+            numstat_rows=staged.numstat_rows,
+            file_sizes=sizes,
+            max_file_size_kb=512,
+            allow_sensitive=False,
+            allow_local_artifacts=False,
+            allow_protected_branch=False,
+            allow_large_or_binary=False,
+        )
+    )
+
+    argv = ["--jobs", str(jobs)]
+    phases["main"], phases["exit"] = timed(lambda: run_main([*argv, "--no-cache"]))
+    for name in (gate.CACHE_FILE_NAME, gate.VERDICT_FILE_NAME):
+        cache_path = gate.run_git(["rev-parse", "--git-path", name]).stdout.strip()
+        if os.path.exists(cache_path):
+            os.unlink(cache_path)
+    phases["main_cache_cold"], _ = timed(lambda: run_main(argv))
+    phases["main_cache_warm"], _ = timed(lambda: run_main(argv))
+    return phases
+
+
+def repo_stats(repo: str) -> dict[str, int]:
+    with inside(repo):
+        staged = gate.read_staged_diff(scan_sensitive=False, jobs=1, cache=None)
+    total = 0
+    for root, dirs, files in os.walk(repo):
+        dirs[:] = [name for name in dirs if name != ".git"]
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return {"staged_entries": len(staged.raw_entries), "worktree_bytes": total}
+
+
+def bench_shape(shape: str, args: argparse.Namespace) -> dict[str, object]:
+    setup_seconds, repo = timed(lambda: build_repo(shape, args))
+    try:
+        stats = repo_stats(repo)
+        with inside(repo):
+            runs = [measure_once(args.jobs) for _ in range(args.repeat)]
+    finally:
+        if args.keep:
+            print(f"[bench] kept {shape} repo at {repo}", file=sys.stderr)
+        else:
+            shutil.rmtree(repo, ignore_errors=True)
+
+    phases = {
+        name: round(statistics.median(run[name] for run in runs), 6)
+        for name in runs[0]
+        if name != "exit"
+    }
+    return {
+        "benchmark": "synthetic_repo",
+        "shape": shape,
+        "setup_seconds": round(setup_seconds, 3),
+        **stats,
+        "exit": runs[0]["exit"],
+        "phase_seconds": phases,
+    }
+
+
+def source_revision() -> str | None:
+    result = subprocess.run(
+        ["git", "rev-parse", "HEAD"],
+        cwd=SCRIPTS_DIR,
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+    return result.stdout.strip() or None
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Time the safety gate against generated git repositories."
+    )
+    parser.add_argument(
+        "--shape",
+        action="append",
+        choices=SHAPES,
+        help="Repository shape to benchmark; repeatable (default: all).",
+    )
+    parser.add_argument(
+        "--small-files", type=int, default=10_000, help="small-files: file count."
+    )
+    parser.add_argument(
+        "--minified-mb", type=int, default=200, help="minified: bundle size in MB."
+    )
+    parser.add_argument(
+        "--minified-line-kb",
+        type=int,
+        default=0,
+        help="minified: wrap the bundle every N KB; 0 keeps one line (default).",
+    )
+    parser.add_argument(
+        "--binary-files", type=int, default=20, help="binary: file count."
+    )
+    parser.add_argument(
+        "--binary-mb", type=int, default=50, help="binary: total size in MB."
+    )
+    parser.add_argument(
+        "--vendor-packages", type=int, default=200, help="vendor: package count."
+    )
+    parser.add_argument(
+        "--vendor-depth", type=int, default=12, help="vendor: directory depth."
+    )
+    parser.add_argument(
+        "--renames", type=int, default=5_000, help="renames: files moved."
+    )
+    parser.add_argument("--jobs", type=int, default=1, help="Gate --jobs value.")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timing repetitions (default: 3)."
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed.")
+    parser.add_argument("--output", help="Write the JSON report here.")
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep generated repos for inspection."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    report = {
+        "revision": source_revision(),
+        "python": platform.python_version(),
+        "results": [bench_shape(shape, args) for shape in args.shape or SHAPES],
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
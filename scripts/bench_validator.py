@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Throughput and scaling benchmarks for validate_conventional_commit.py.
+
+Exits 1 when an adversarial message shape costs more per line as it grows,
+so CI catches footer detection turning quadratic again.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections.abc import Callable, Sequence
+
+from validate_conventional_commit import (
+    ALLOWED_TYPES,
+    Validator,
+    parse_message,
+    validate,
+)
+
+SUBJECTS = (
+    "add refresh token rotation",
+    "handle empty pagination cursor",
+    "Updated readme",
+    "split parser into modules.",
+    "remove  legacy flag",
+)
+BODIES = (
+    "",
+    "\n\nExplain why the change is needed and what it affects.",
+    "\n\nMigrate callers first.\n\nBREAKING CHANGE: the v1 endpoint is gone",
+    "\n\nRefs: #123\nReviewed-by: someone",
+    "\n\nThis is a breaking change for old clients.",
+)
+OPTIONS = {
+    "max_subject_length": 72,
+    "max_header_length": 100,
+    "allow_underscore_scope": True,
+    "subject_lowercase_mode": "warn",
+    "imperative_mode": "warn",
+    "allowed_types": ALLOWED_TYPES,
+}
+
+
+def synthetic_messages(count: int, seed: int) -> list[str]:
+    """Headers, bodies and footers in the mix a history audit sees."""
+    rng = random.Random(seed)
+    scopes = ("", "(api)", "(core)", "(ui_kit)")
+    messages: list[str] = []
+    for _ in range(count):
+        kind = rng.choice(ALLOWED_TYPES + ("feature",))
+        bang = "!" if rng.random() < 0.05 else ""
+        header = f"{kind}{rng.choice(scopes)}{bang}: {rng.choice(SUBJECTS)}"
+        messages.append(header + rng.choice(BODIES))
+    return messages
+
+
+# Large messages shaped to defeat footer detection that rescans lines.
+ADVERSARIAL_SHAPES: dict[str, Callable[[int], str]] = {
+    # A trailer-like first line, then one long run of blank separators.
+    "blank-run": lambda lines: "feat: x\n\nRefs: #1\nplain\n" + "\n" * lines + "end",
+    # Paragraphs split by blank lines with no footer at all.
+    "paragraphs": lambda lines: "feat: x\n\n" + "text\n\n" * (lines // 2) + "end",
+    # Trailers after every blank line, then a body line that voids them.
+    "trailer-storm": lambda lines: (
+        "feat: x\n\nbody\n" + "\nRefs: #1\n  more" * (lines // 3) + "\nplain"
+    ),
+    # A squash merge of many commits, each with its own sign-off.
+    "squash-merge": lambda lines: (
+        "feat: squash\n\n"
+        + "* fix: item\n\n  detail\n\nSigned-off-by: a <a@b.c>\n\n" * (lines // 6)
+        + "Reviewed-by: b <b@c.d>"
+    ),
+}
+
+
+def time_best(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench_validator(messages: Sequence[str], repeat: int) -> dict[str, object]:
+    validator = Validator(**OPTIONS)
+
+    def per_call() -> list[tuple[list[str], list[str]]]:
+        return [validate(message, **OPTIONS) for message in messages]
+
+    def reused() -> list[tuple[list[str], list[str]]]:
+        check = validator.validate
+        return [check(message) for message in messages]
+
+    if per_call() != reused():
+        raise SystemExit("Validator disagrees with validate()")
+
+    per_call_seconds = time_best(per_call, repeat)
+    reused_seconds = time_best(reused, repeat)
+    return {
+        "benchmark": "validator",
+        "messages": len(messages),
+        "function_per_second": round(len(messages) / per_call_seconds),
+        "validator_per_second": round(len(messages) / reused_seconds),
+        "speedup": round(per_call_seconds / reused_seconds, 2),
+    }
+
+
+def bench_scaling(
+    sizes: Sequence[int], repeat: int, max_growth: float
+) -> list[dict[str, object]]:
+    """Time each adversarial shape at growing sizes; per-line cost must stay flat."""
+    validator = Validator(**OPTIONS)
+    results: list[dict[str, object]] = []
+    for shape, build in ADVERSARIAL_SHAPES.items():
+        per_line: list[float] = []
+        for size in sizes:
+            message = build(size)
+            line_count = message.count("\n") + 1
+
+            def run(message: str = message) -> object:
+                return validator.validate(message), parse_message(message).trailers
+
+            per_line.append(time_best(run, repeat) / line_count * 1e9)
+        growth = max(per_line) / min(per_line)
+        results.append(
+            {
+                "benchmark": f"scaling:{shape}",
+                "lines": list(sizes),
+                "ns_per_line": [round(value, 1) for value in per_line],
+                "growth": round(growth, 2),
+                "linear": growth <= max_growth,
+            }
+        )
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark commit validation.")
+    parser.add_argument(
+        "--messages",
+        type=int,
+        default=100_000,
+        help="Number of synthetic commit messages (default: 100000).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timing repetitions (default: 3)."
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed.")
+    parser.add_argument(
+        "--scaling-lines",
+        default="2000,20000,200000",
+        help="Comma-separated sizes of the adversarial messages "
+        "(default: 2000,20000,200000).",
+    )
+    parser.add_argument(
+        "--max-growth",
+        type=float,
+        default=4.0,
+        help="Fail when the per-line cost of a shape grows more than this "
+        "factor between sizes (default: 4.0).",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    messages = synthetic_messages(args.messages, args.seed)
+    sizes = [int(size) for size in args.scaling_lines.split(",")]
+    scaling = bench_scaling(sizes, args.repeat, args.max_growth)
+    print(json.dumps([bench_validator(messages, args.repeat), *scaling], indent=2))
+    return 0 if all(result["linear"] for result in scaling) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Run the safety gate and the commit validator as git's commit hooks.
+
+One entry point serves both hooks git runs during ``git commit``:
+
+    python3 scripts/commit_hook_runner.py install [--force]
+    python3 scripts/commit_hook_runner.py pre-commit [gate args...]
+    python3 scripts/commit_hook_runner.py commit-msg FILE [validator args...]
+
+``install`` writes ``pre-commit`` and ``commit-msg`` hooks that call this
+script. The script can also be linked as a hook directly; it then takes the
+hook name from its own file name.
+
+Each hook goes through the ``commit_hook_server`` client: with a server
+running, both hooks of a commit are answered by the same warm process;
+without one, the tool runs in-process. Rule config is shared through the
+rule bundle ``commit_rules_config`` keeps under the git directory, and the
+repository is located without running git.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import argparse
+
+# Hook name -> commit_hook_server tool.
+HOOKS = {
+    "pre-commit": "gate",
+    "commit-msg": "validate",
+}
+HOOK_MARKER = "# Installed by commit_hook_runner.py"
+HOOK_TEMPLATE = """#!/bin/sh
+{marker}; rerun its install command to update.
+exec {python} {runner} {hook} "$@"{extra}
+"""
+
+
+def run_hook(hook: str, argv: list[str]) -> int:
+    from commit_hook_server import run_client
+
+    if hook == "commit-msg":
+        if not argv:
+            print("[commit-msg] ERROR: missing commit message file.", file=sys.stderr)
+            return 2
+        argv = ["--file", argv[0], *argv[1:]]
+    return run_client(HOOKS[hook], argv)
+
+
+def hooks_dir() -> str | None:
+    """Hooks directory git reads, honoring ``core.hooksPath``."""
+    import subprocess
+
+    result = subprocess.run(
+        ["git", "rev-parse", "--git-path", "hooks"],
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        return None
+    return os.path.abspath(result.stdout.strip())
+
+
+def hook_script(hook: str, extra_args: str) -> str:
+    import shlex
+
+    extra = "".join(f" {shlex.quote(arg)}" for arg in shlex.split(extra_args))
+    return HOOK_TEMPLATE.format(
+        marker=HOOK_MARKER,
+        python=shlex.quote(sys.executable),
+        runner=shlex.quote(os.path.abspath(__file__)),
+        hook=hook,
+        extra=extra,
+    )
+
+
+def install(args: argparse.Namespace) -> int:
+    directory = hooks_dir()
+    if directory is None:
+        print("[hook-runner] ERROR: not inside a git repository.", file=sys.stderr)
+        return 1
+    scripts = {
+        "pre-commit": hook_script("pre-commit", args.gate_args),
+        "commit-msg": hook_script("commit-msg", args.validate_args),
+    }
+    paths = {hook: os.path.join(directory, hook) for hook in scripts}
+    if not args.force:
+        for path in paths.values():
+            try:
+                with open(path, encoding="utf-8", errors="replace") as handle:
+                    existing = handle.read()
+            except OSError:
+                continue
+            if HOOK_MARKER not in existing:
+                print(
+                    f"[hook-runner] ERROR: {path} exists and was not installed "
+                    "by this script; use --force to replace it.",
+                    file=sys.stderr,
+                )
+                return 1
+    os.makedirs(directory, exist_ok=True)
+    for hook, path in paths.items():
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(scripts[hook])
+        os.chmod(path, 0o755)
+        print(f"[hook-runner] installed {path}")
+    return 0
+
+
+def parse_install_args(argv: list[str]) -> argparse.Namespace:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Install pre-commit and commit-msg hooks that run the safety "
+        "gate and the commit validator through this script. Use 'pre-commit' "
+        "or 'commit-msg' followed by the tool's own arguments to run a hook."
+    )
+    parser.add_argument("command", choices=("install",))
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Replace existing hooks that this script did not install.",
+    )
+    parser.add_argument(
+        "--gate-args",
+        default="",
+        help="Extra safety gate arguments for the pre-commit hook, "
+        "e.g. '--fail-fast --jobs 0'.",
+    )
+    parser.add_argument(
+        "--validate-args",
+        default="",
+        help="Extra validator arguments for the commit-msg hook, "
+        "e.g. '--strict-scope'.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+        invoked_as = os.path.basename(sys.argv[0])
+        if invoked_as in HOOKS:
+            return run_hook(invoked_as, argv)
+    if argv and argv[0] in HOOKS:
+        return run_hook(argv[0], argv[1:])
+    return install(parse_install_args(argv))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Keep the safety gate and commit validator warm behind a local Unix socket.
+
+Hooks call this script as a thin client:
+
+    python3 scripts/commit_hook_server.py gate [gate args...]
+    python3 scripts/commit_hook_server.py validate [validator args...]
+
+When a server started with ``serve`` is listening, the request is answered by
+the already-imported modules; otherwise the tool runs in-process, so hooks
+behave the same whether or not the server is up. The client path imports
+``json`` and ``socket`` only once a server socket exists.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import argparse
+    import io
+    import socket
+    from types import ModuleType
+
+TOOLS = {
+    "gate": "precommit_safety_gate",
+    "validate": "validate_conventional_commit",
+}
+SOCKET_ENV = "COMMIT_HOOK_SERVER_SOCKET"
+SOCKET_NAME = "commit-hook-server.sock"
+# Arguments that make a tool read stdin, which the client then forwards.
+STDIN_FLAGS = ("--stdin", "--pre-receive", "-")
+
+
+def socket_path() -> str | None:
+    configured = os.environ.get(SOCKET_ENV)
+    if configured:
+        return configured
+
+    try:
+        from commit_rules_config import find_repository
+    except ImportError:  # script copied on its own
+        pass
+    else:
+        _, git_dir = find_repository()
+        return os.path.join(git_dir, SOCKET_NAME) if git_dir else None
+
+    import subprocess
+
+    result = subprocess.run(
+        ["git", "rev-parse", "--git-path", SOCKET_NAME],
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        return None
+    return os.path.abspath(result.stdout.strip())
+
+
+def send_request(path: str, request: dict[str, object]) -> dict[str, object] | None:
+    """Send one request and return the reply, or ``None`` if no server answers."""
+    import json
+    import socket
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(1.0)
+            client.connect(path)
+            client.settimeout(None)
+            client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            client.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = client.recv(1 << 16)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+    if not chunks:
+        return None
+    return json.loads(b"".join(chunks))
+
+
+def stdin_stream(data: str) -> io.TextIOWrapper:
+    """Rebuild forwarded stdin as a text stream with a binary ``buffer``.
+
+    The client sends stdin bytes decoded with ``surrogateescape``, so tools
+    that read ``sys.stdin.buffer`` get back the exact bytes.
+    """
+    import io
+
+    raw = io.BytesIO(data.encode("utf-8", "surrogateescape"))
+    return io.TextIOWrapper(raw, encoding="utf-8")
+
+
+def run_in_process(tool: str, argv: list[str]) -> int:
+    import importlib
+
+    return importlib.import_module(TOOLS[tool]).main(argv)
+
+
+def run_client(tool: str, argv: list[str]) -> int:
+    path = socket_path()
+    if path is not None and os.path.exists(path):
+        request: dict[str, object] = {
+            "tool": tool,
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+        }
+        if any(flag in argv for flag in STDIN_FLAGS):
+            data = sys.stdin.buffer.read()
+            request["stdin"] = data.decode("utf-8", "surrogateescape")
+        reply = send_request(path, request)
+        if reply is not None:
+            sys.stdout.write(str(reply["stdout"]))
+            sys.stderr.write(str(reply["stderr"]))
+            return int(reply["exit"])
+        if "stdin" in request:
+            sys.stdin = stdin_stream(str(request["stdin"]))
+    return run_in_process(tool, argv)
+
+
+class HookServer:
+    """Serve gate/validator requests sequentially from warm, imported modules."""
+
+    def __init__(self, path: str, idle_timeout: float) -> None:
+        import importlib
+
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.modules = {
+            tool: importlib.import_module(name) for tool, name in TOOLS.items()
+        }
+        self.mtimes = {tool: self._mtime(tool) for tool in TOOLS}
+        self.running = True
+
+    def _mtime(self, tool: str) -> float:
+        try:
+            return os.path.getmtime(self.modules[tool].__file__ or "")
+        except OSError:
+            return 0.0
+
+    def _fresh_module(self, tool: str) -> ModuleType:
+        """Reload a tool whose script changed on disk since it was imported."""
+        import importlib
+
+        mtime = self._mtime(tool)
+        if mtime != self.mtimes[tool]:
+            self.modules[tool] = importlib.reload(self.modules[tool])
+            self.mtimes[tool] = mtime
+        return self.modules[tool]
+
+    def handle(self, request: dict[str, object]) -> dict[str, object]:
+        import io
+        from contextlib import redirect_stderr, redirect_stdout
+
+        if request.get("tool") == "stop":
+            self.running = False
+            return {"exit": 0, "stdout": "", "stderr": ""}
+
+        tool = str(request["tool"])
+        module = self._fresh_module(tool)
+        stdout, stderr = io.StringIO(), io.StringIO()
+        saved_env, saved_cwd, saved_stdin = dict(os.environ), os.getcwd(), sys.stdin
+        os.environ.clear()
+        os.environ.update(request["env"])
+        try:
+            os.chdir(str(request["cwd"]))
+            sys.stdin = stdin_stream(str(request.get("stdin", "")))
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                try:
+                    code = module.main(list(request["argv"]))
+                except SystemExit as exc:
+                    code = exc.code if isinstance(exc.code, int) else 1
+        finally:
+            sys.stdin = saved_stdin
+            os.chdir(saved_cwd)
+            os.environ.clear()
+            os.environ.update(saved_env)
+        return {"exit": code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+    def bind(self) -> socket.socket:
+        import socket
+
+        if os.path.exists(self.path):
+            if send_request(self.path, {"tool": "ping"}) is not None:
+                raise OSError(f"a server is already listening on {self.path}")
+            os.unlink(self.path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)
+        try:
+            server.bind(self.path)
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+        return server
+
+    def serve(self, server: socket.socket) -> None:
+        server.settimeout(self.idle_timeout or None)
+        try:
+            while self.running:
+                try:
+                    conn, _ = server.accept()
+                except TimeoutError:
+                    break
+                with conn:
+                    self._serve_connection(conn)
+        finally:
+            server.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _serve_connection(self, conn: socket.socket) -> None:
+        import json
+
+        chunks = []
+        while True:
+            chunk = conn.recv(1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        try:
+            request = json.loads(b"".join(chunks))
+            if request.get("tool") == "ping":
+                reply: dict[str, object] = {"exit": 0, "stdout": "", "stderr": ""}
+            else:
+                reply = self.handle(request)
+        except (OSError, ValueError, LookupError, TypeError) as exc:
+            # Report a bad request or a failing tool instead of dying.
+            reply = {"exit": 1, "stdout": "", "stderr": f"[hook-server] {exc}\n"}
+        conn.sendall(json.dumps(reply).encode("utf-8"))
+
+
+def parse_server_args(argv: list[str]) -> argparse.Namespace:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Resident server for the safety gate and commit validator. "
+        "Use 'gate' or 'validate' followed by the tool's own arguments to run "
+        "a check through the server (or in-process when it is not running)."
+    )
+    parser.add_argument("command", choices=("serve", "stop"))
+    parser.add_argument(
+        "--socket",
+        help=f"Socket path (default: $(git rev-parse --git-path {SOCKET_NAME})).",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=1800,
+        help="Exit after this many idle seconds; 0 disables (default: 1800).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in TOOLS:
+        return run_client(argv[0], argv[1:])
+
+    args = parse_server_args(argv)
+    path = args.socket or socket_path()
+    if path is None:
+        print("[hook-server] ERROR: not inside a git repository.", file=sys.stderr)
+        return 1
+
+    if args.command == "stop":
+        if send_request(path, {"tool": "stop"}) is None:
+            print("[hook-server] no server running.", file=sys.stderr)
+            return 1
+        return 0
+
+    server = HookServer(path, args.idle_timeout)
+    try:
+        listener = server.bind()
+    except OSError as exc:
+        print(f"[hook-server] ERROR: {exc}", file=sys.stderr)
+        return 1
+    print(f"[hook-server] listening on {path}", file=sys.stderr)
+    server.serve(listener)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
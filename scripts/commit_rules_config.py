@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""Load repository rule overrides for the safety gate and commit validator.
+
+Rules live in ``.commit-batcher.toml`` at the repository root, or in the
+``[tool.commit-batcher]`` table of ``pyproject.toml``. Every table replaces
+the built-in default; the ``extend-`` form appends to it instead:
+
+    allowed-types = ["feat", "fix", "docs"]
+    extend-allowed-types = ["deps"]
+    protected-branches = ['^(main|trunk)$']
+    extend-sensitive-paths = ['(^|/)vault\\.json$']
+    extend-local-artifacts = ['(^|/)\\.terraform/']
+    extend-content-rules = [
+        {name = "slack_token", pattern = 'xox[abp]-[0-9a-z-]+', literals = ["xox"]},
+    ]
+
+Parsed and validated rules are kept in a marshal bundle under the git
+directory, keyed by the config file's path, mtime and size, and by its
+content hash when the mtime moves. Unchanged configs are never re-parsed.
+``COMMIT_BATCHER_CONFIG`` names a config file explicitly, for bare
+repositories or CI.
+"""
+
+from __future__ import annotations
+
+import marshal
+import os
+import re
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from typing import Any, TypeVar
+
+    T = TypeVar("T")
+
+CONFIG_FILE_NAME = ".commit-batcher.toml"
+PYPROJECT_FILE_NAME = "pyproject.toml"
+PYPROJECT_TABLE = "commit-batcher"
+CONFIG_ENV = "COMMIT_BATCHER_CONFIG"
+BUNDLE_FILE_NAME = "commit-batcher-rules.marshal"
+BUNDLE_FORMAT = 2
+
+TABLES = {
+    "allowed-types": "types",
+    "protected-branches": "patterns",
+    "sensitive-paths": "patterns",
+    "local-artifacts": "patterns",
+    "content-rules": "rules",
+}
+TYPE_NAME_RE = re.compile(r"^[a-z][a-z0-9-]*$")
+# Configured rules may not repeat, more than this many times, a group that
+# holds another repeat or alternatives able to match the same text, as in
+# (a+)+, (\w+\s?)* or (a|aa)+. Such patterns can backtrack exponentially on
+# a near-miss line. Smaller bounded repeats, such as (?:\.\d+){0,3}, are fine.
+MAX_SAFE_REPEAT = 10
+
+# First-character sets hold ASCII code points, plus NON_ASCII for the rest.
+NON_ASCII = -1
+ANY_CHAR = frozenset(range(128)) | {NON_ASCII}
+CATEGORY_ESCAPES = {"DIGIT": r"\d", "SPACE": r"\s", "WORD": r"\w", "LINEBREAK": "\n"}
+
+
+class RuleConfigError(ValueError):
+    """Raised when a rule config file cannot be read or is invalid."""
+
+
+def find_repository(start: str | None = None) -> tuple[str | None, str | None]:
+    """Return ``(worktree_root, git_dir)`` without running git.
+
+    Honors ``GIT_DIR``/``GIT_WORK_TREE`` as hooks see them, otherwise walks up
+    from ``start`` to the first directory holding ``.git``.
+    """
+    env_git_dir = os.environ.get("GIT_DIR")
+    directory = os.path.abspath(start or os.getcwd())
+    while True:
+        dot_git = os.path.join(directory, ".git")
+        if os.path.isdir(dot_git):
+            git_dir: str | None = dot_git
+            break
+        if os.path.isfile(dot_git):
+            git_dir = read_gitdir_file(dot_git)
+            break
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            directory, git_dir = "", None
+            break
+        directory = parent
+    if env_git_dir:
+        git_dir = os.path.abspath(env_git_dir)
+    root = os.environ.get("GIT_WORK_TREE") or directory or None
+    return root, git_dir
+
+
+def read_gitdir_file(path: str) -> str | None:
+    """Resolve a ``gitdir: <path>`` pointer file (linked worktrees, submodules)."""
+    try:
+        with open(path, encoding="utf-8") as handle:
+            content = handle.read().strip()
+    except OSError:
+        return None
+    if not content.startswith("gitdir:"):
+        return None
+    target = content[len("gitdir:") :].strip()
+    return os.path.normpath(os.path.join(os.path.dirname(path), target))
+
+
+def find_config(root: str | None) -> str | None:
+    configured = os.environ.get(CONFIG_ENV)
+    if configured:
+        return os.path.abspath(configured)
+    if root is None:
+        return None
+    for name in (CONFIG_FILE_NAME, PYPROJECT_FILE_NAME):
+        candidate = os.path.join(root, name)
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def parse_toml(data: bytes) -> dict[str, Any]:
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise RuleConfigError(
+                "reading rule config needs Python 3.11+ or the 'tomli' package"
+            ) from None
+    try:
+        return tomllib.loads(data.decode("utf-8"))
+    except (UnicodeDecodeError, tomllib.TOMLDecodeError) as exc:
+        raise RuleConfigError(str(exc)) from exc
+
+
+def check_pattern(key: str, value: object) -> str:
+    if not isinstance(value, str):
+        raise RuleConfigError(f"{key}: patterns must be strings, got {value!r}")
+    try:
+        re.compile(value)
+    except re.error as exc:
+        raise RuleConfigError(f"{key}: invalid pattern {value!r}: {exc}") from exc
+    problem = backtracking_risk(value)
+    if problem:
+        raise RuleConfigError(
+            f"{key}: pattern {value!r} repeats {problem}, which can "
+            "backtrack catastrophically"
+        )
+    return value
+
+
+def backtracking_risk(pattern: str) -> str | None:
+    """Describe what in ``pattern`` can backtrack exponentially, or None.
+
+    Walks the parsed regex: a repeat with an unbounded or large maximum may
+    hold, at any depth, neither a variable repeat nor alternatives that can
+    start with the same character or match nothing.
+    """
+    try:
+        from re import _parser as sre
+    except ImportError:  # Python < 3.11
+        import sre_parse as sre
+
+    return repeat_risk(sre, sre.parse(pattern), False)
+
+
+def repeat_risk(sre: Any, items: Any, repeated: bool) -> str | None:
+    for op, av in items:
+        if op in repeat_ops(sre):
+            low, high, body = av
+            if repeated and high > 1 and high != low:
+                return "a repeated group"
+            large = high == sre.MAXREPEAT or high > MAX_SAFE_REPEAT
+            children = [body]
+            inner = repeated or large
+        elif op is sre.BRANCH:
+            if repeated and branches_overlap(sre, av[1]):
+                return "overlapping alternatives"
+            children, inner = av[1], repeated
+        else:
+            children, inner = subpatterns(sre, op, av), repeated
+        for child in children:
+            problem = repeat_risk(sre, child, inner)
+            if problem:
+                return problem
+    return None
+
+
+def repeat_ops(sre: Any) -> tuple[Any, ...]:
+    possessive = getattr(sre, "POSSESSIVE_REPEAT", None)  # Python 3.11+
+    return (sre.MAX_REPEAT, sre.MIN_REPEAT) + ((possessive,) if possessive else ())
+
+
+def subpatterns(sre: Any, op: Any, av: Any) -> list[Any]:
+    if op is sre.SUBPATTERN:
+        return [av[-1]]
+    if op in (sre.ASSERT, sre.ASSERT_NOT):
+        return [av[1]]
+    if op is getattr(sre, "ATOMIC_GROUP", None):
+        return [av]
+    if op is sre.GROUPREF_EXISTS:
+        return [branch for branch in av[1:] if branch is not None]
+    return []
+
+
+def branches_overlap(sre: Any, branches: Sequence[Any]) -> bool:
+    """Whether two alternatives can start alike, or one can match nothing."""
+    firsts = []
+    for branch in branches:
+        chars, nullable = first_chars(sre, branch)
+        if nullable:
+            return True
+        firsts.append(case_folded(chars))
+    return any(
+        firsts[i] & firsts[j]
+        for i in range(len(firsts))
+        for j in range(i + 1, len(firsts))
+    )
+
+
+def first_chars(sre: Any, items: Any) -> tuple[set[int], bool]:
+    """Characters a match of ``items`` can start with, and whether it can be empty."""
+    chars: set[int] = set()
+    for op, av in items:
+        if op is sre.LITERAL:
+            first, nullable = {av if av < 128 else NON_ASCII}, False
+        elif op is sre.IN:
+            first, nullable = class_chars(sre, av), False
+        elif op in (sre.ANY, sre.NOT_LITERAL):
+            first, nullable = set(ANY_CHAR), False
+        elif op in repeat_ops(sre):
+            first, nullable = first_chars(sre, av[2])
+            nullable = nullable or av[0] == 0
+        elif op is sre.BRANCH:
+            first, nullable = set(), False
+            for branch in av[1]:
+                branch_chars, branch_nullable = first_chars(sre, branch)
+                first |= branch_chars
+                nullable = nullable or branch_nullable
+        elif op in (sre.AT, sre.ASSERT, sre.ASSERT_NOT):
+            first, nullable = set(), True
+        elif op is sre.SUBPATTERN:
+            first, nullable = first_chars(sre, av[-1])
+        else:
+            first, nullable = set(ANY_CHAR), True
+        chars |= first
+        if not nullable:
+            return chars, False
+    return chars, True
+
+
+def class_chars(sre: Any, items: Any) -> set[int]:
+    chars: set[int] = set()
+    negate = False
+    for op, av in items:
+        if op is sre.NEGATE:
+            negate = True
+        elif op is sre.LITERAL:
+            chars.add(av if av < 128 else NON_ASCII)
+        elif op is sre.RANGE:
+            low, high = av
+            chars.update(range(low, min(high, 127) + 1))
+            if high > 127:
+                chars.add(NON_ASCII)
+        elif op is sre.CATEGORY:
+            chars |= category_chars(av.name)
+        else:
+            chars |= ANY_CHAR
+    if negate:
+        return set(ANY_CHAR - case_folded(chars)) | {NON_ASCII}
+    return chars
+
+
+def category_chars(name: str) -> set[int]:
+    kind = name.removeprefix("CATEGORY_")
+    negate = kind.startswith("NOT_")
+    escape = CATEGORY_ESCAPES.get(kind.removeprefix("NOT_"))
+    if escape is None:
+        return set(ANY_CHAR)
+    chars = {code for code in range(128) if re.match(escape, chr(code))}
+    if negate:
+        chars = set(ANY_CHAR) - chars
+    return chars | {NON_ASCII}
+
+
+def case_folded(chars: set[int]) -> set[int]:
+    return chars | {
+        code ^ 0x20 for code in chars if 0 <= code < 128 and chr(code).isalpha()
+    }
+
+
+def check_entry(key: str, kind: str, value: object) -> Any:
+    if kind == "patterns":
+        return check_pattern(key, value)
+    if kind == "types":
+        if not isinstance(value, str) or not TYPE_NAME_RE.match(value):
+            raise RuleConfigError(f"{key}: invalid commit type {value!r}")
+        return value
+    if not isinstance(value, dict) or set(value) - {"name", "pattern", "literals"}:
+        raise RuleConfigError(
+            f"{key}: rules must be tables with name, pattern and optional literals"
+        )
+    name = value.get("name")
+    if not isinstance(name, str) or not name:
+        raise RuleConfigError(f"{key}: rule without a name: {value!r}")
+    pattern = check_pattern(key, value.get("pattern"))
+    try:
+        # Content rules run on raw diff bytes; see precommit_safety_gate.
+        re.compile(pattern.encode("utf-8", "surrogateescape"))
+    except re.error as exc:
+        raise RuleConfigError(
+            f"{key}: {name}: pattern must also compile for raw diff bytes: {exc}"
+        ) from exc
+    literals = value.get("literals", [])
+    if not isinstance(literals, list) or not all(
+        isinstance(item, str) and item for item in literals
+    ):
+        raise RuleConfigError(f"{key}: {name}: literals must be non-empty strings")
+    # The scanner probes literals against the lowercased line.
+    return [name, pattern, [x.lower() for x in literals]]
+
+
+def compile_rules(table: dict[str, Any]) -> dict[str, Any]:
+    """Validate a config table into plain data: ``{table: {replace, extend}}``."""
+    rules: dict[str, Any] = {}
+    for key, value in table.items():
+        name = key.removeprefix("extend-")
+        if name not in TABLES:
+            raise RuleConfigError(f"unknown setting {key!r}")
+        if not isinstance(value, list):
+            raise RuleConfigError(f"{key}: expected a list")
+        entries = [check_entry(key, TABLES[name], item) for item in value]
+        slot = rules.setdefault(name, {"replace": None, "extend": []})
+        slot["extend" if key.startswith("extend-") else "replace"] = entries
+    return rules
+
+
+def read_rules(path: str, data: bytes) -> dict[str, Any]:
+    document = parse_toml(data)
+    if os.path.basename(path) == PYPROJECT_FILE_NAME:
+        document = document.get("tool", {}).get(PYPROJECT_TABLE, {})
+    if not isinstance(document, dict):
+        raise RuleConfigError(f"[tool.{PYPROJECT_TABLE}] must be a table")
+    return compile_rules(document)
+
+
+def read_bundle(path: str) -> dict[str, Any] | None:
+    try:
+        with open(path, "rb") as handle:
+            bundle = marshal.load(handle)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(bundle, dict) or bundle.get("format") != BUNDLE_FORMAT:
+        return None
+    return bundle
+
+
+def write_bundle(path: str, bundle: dict[str, Any]) -> None:
+    import tempfile
+
+    try:
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=os.path.dirname(path), delete=False
+        ) as handle:
+            marshal.dump(bundle, handle)
+        os.replace(handle.name, path)
+    except OSError:
+        return
+
+
+def load_rule_config(start: str | None = None) -> dict[str, Any]:
+    """Return the repository's rule overrides, or ``{}`` when there are none.
+
+    Raises ``RuleConfigError`` for an unreadable or invalid config.
+    """
+    root, git_dir = find_repository(start)
+    config = find_config(root)
+    if config is None:
+        return {}
+    try:
+        stat = os.stat(config)
+    except OSError as exc:
+        raise RuleConfigError(f"{config}: {exc.strerror}") from exc
+
+    bundle_path = os.path.join(git_dir, BUNDLE_FILE_NAME) if git_dir else None
+    bundle = read_bundle(bundle_path) if bundle_path else None
+    stamp = [config, stat.st_mtime_ns, stat.st_size]
+    if bundle is not None and bundle["stamp"] == stamp:
+        return bundle["rules"]
+
+    import hashlib
+
+    try:
+        with open(config, "rb") as handle:
+            data = handle.read()
+    except OSError as exc:
+        raise RuleConfigError(f"{config}: {exc.strerror}") from exc
+    digest = hashlib.sha256(data).hexdigest()
+    if bundle is not None and bundle["stamp"][0] == config and bundle["hash"] == digest:
+        rules = bundle["rules"]
+    else:
+        try:
+            rules = read_rules(config, data)
+        except RuleConfigError as exc:
+            raise RuleConfigError(f"{config}: {exc}") from exc
+    if bundle_path is not None:
+        write_bundle(
+            bundle_path,
+            {"format": BUNDLE_FORMAT, "stamp": stamp, "hash": digest, "rules": rules},
+        )
+    return rules
+
+
+def apply_table(
+    defaults: Sequence[T],
+    rules: dict[str, Any],
+    name: str,
+    build: Callable[[Any], T],
+) -> tuple[T, ...]:
+    """Return ``defaults`` with the ``name`` table's replace/extend entries applied."""
+    slot = rules.get(name)
+    if slot is None:
+        return tuple(defaults)
+    base = defaults if slot["replace"] is None else [build(x) for x in slot["replace"]]
+    return (*base, *(build(entry) for entry in slot["extend"]))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Unit tests for commit_hook_runner.py."""
+
+import os
+import subprocess
+import threading
+
+from commit_hook_runner import main
+from commit_hook_server import SOCKET_ENV, SOCKET_NAME, HookServer, send_request
+
+
+def git(repo, *args, check=True):
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=check, capture_output=True, text=True
+    )
+
+
+def init_repo(path, monkeypatch):
+    git(path, "init", "-q")
+    git(path, "config", "user.name", "Test")
+    git(path, "config", "user.email", "test@example.com")
+    git(path, "checkout", "-q", "-b", "feature/demo")
+    monkeypatch.chdir(path)
+    for name in ("GIT_DIR", "GIT_WORK_TREE", "GIT_INDEX_FILE", "COMMIT_BATCHER_CONFIG"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.delenv(SOCKET_ENV, raising=False)
+
+
+def test_installed_hooks_gate_and_validate_commits(tmp_path, monkeypatch):
+    init_repo(tmp_path, monkeypatch)
+    assert main(["install", "--validate-args", "--imperative-mode error"]) == 0
+    hook = tmp_path / ".git" / "hooks" / "commit-msg"
+    assert os.access(hook, os.X_OK)
+    assert 'commit-msg "$@" --imperative-mode error' in hook.read_text()
+
+    (tmp_path / ".commit-batcher.toml").write_text('extend-allowed-types = ["deps"]\n')
+    git(tmp_path, "add", ".commit-batcher.toml")
+    assert git(tmp_path, "commit", "-q", "-m", "deps: add rule config").returncode == 0
+
+    (tmp_path / "notes.txt").write_text("hello\n")
+    git(tmp_path, "add", "notes.txt")
+    rejected = git(tmp_path, "commit", "-q", "-m", "docs: added notes", check=False)
+    assert rejected.returncode != 0
+    assert "imperative mood" in rejected.stderr
+
+    # An edited config applies to the very next commit.
+    (tmp_path / ".commit-batcher.toml").write_text('allowed-types = ["docs"]\n')
+    git(tmp_path, "add", ".")
+    assert git(tmp_path, "commit", "-q", "-m", "docs: add notes").returncode == 0
+    (tmp_path / "notes.txt").write_text("hello again\n")
+    git(tmp_path, "add", "notes.txt")
+    rejected = git(tmp_path, "commit", "-q", "-m", "deps: bump", check=False)
+    assert "Header must match" in rejected.stderr
+
+    (tmp_path / ".env").write_text("TOKEN=1\n")
+    git(tmp_path, "add", ".env")
+    blocked = git(tmp_path, "commit", "-q", "-m", "docs: add env", check=False)
+    assert blocked.returncode != 0 and "[Safety Gate] FAIL" in blocked.stderr
+
+
+def test_hooks_use_a_running_server(tmp_path, monkeypatch, capsys):
+    init_repo(tmp_path, monkeypatch)
+    path = tmp_path / ".git" / SOCKET_NAME
+    server = HookServer(str(path), idle_timeout=30)
+    listener = server.bind()
+    requests = []
+    handle = server.handle
+
+    def recording_handle(request):
+        requests.append(request)
+        return handle(request)
+
+    monkeypatch.setattr(server, "handle", recording_handle)
+    thread = threading.Thread(target=server.serve, args=(listener,), daemon=True)
+    thread.start()
+
+    message = tmp_path / "message.txt"
+    message.write_text("feat: add parser.\n")
+    assert main(["commit-msg", str(message)]) == 1
+    assert "Subject must not end with a period." in capsys.readouterr().out
+    assert requests[0]["argv"] == ["--file", str(message)]
+
+    assert send_request(str(path), {"tool": "stop"}) is not None
+    thread.join(timeout=5)
+    message.write_text("feat: add parser\n")
+    assert main(["commit-msg", str(message)]) == 0
+    assert main(["commit-msg"]) == 2
+
+
+def test_install_keeps_foreign_hooks_without_force(tmp_path, monkeypatch):
+    init_repo(tmp_path, monkeypatch)
+    hook = tmp_path / ".git" / "hooks" / "pre-commit"
+    hook.write_text("#!/bin/sh\nexit 0\n")
+
+    assert main(["install"]) == 1
+    assert hook.read_text() == "#!/bin/sh\nexit 0\n"
+    assert not (tmp_path / ".git" / "hooks" / "commit-msg").exists()
+    assert main(["install", "--force"]) == 0
+    assert main(["install"]) == 0
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Unit tests for commit_hook_server.py."""
+
+import io
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from commit_hook_server import SOCKET_ENV, HookServer, main, send_request
+
+SCRIPT = Path(__file__).with_name("commit_hook_server.py")
+
+
+def start_server(path):
+    server = HookServer(str(path), idle_timeout=30)
+    listener = server.bind()
+    thread = threading.Thread(target=server.serve, args=(listener,), daemon=True)
+    thread.start()
+    return thread
+
+
+def test_server_answers_validator_requests(tmp_path):
+    path = tmp_path / "hook.sock"
+    thread = start_server(path)
+
+    reply = send_request(
+        str(path),
+        {
+            "tool": "validate",
+            "argv": ["feat(api): add endpoint."],
+            "cwd": str(tmp_path),
+            "env": dict(os.environ),
+        },
+    )
+    assert reply is not None
+    assert reply["exit"] == 1
+    assert "Subject must not end with a period." in reply["stdout"]
+
+    assert send_request(str(path), {"tool": "stop"}) is not None
+    thread.join(timeout=5)
+    assert not path.exists()
+
+
+def test_client_runs_in_process_without_server(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv(SOCKET_ENV, str(tmp_path / "missing.sock"))
+
+    assert main(["validate", "fix(api): handle empty cursor"]) == 0
+    assert "[OK]" in capsys.readouterr().out
+
+
+def git(repo, *args, check=True):
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=check, capture_output=True, text=True
+    )
+
+
+def test_server_gates_pushes_read_from_pre_receive_stdin(tmp_path, monkeypatch):
+    for name in ("GIT_DIR", "GIT_WORK_TREE", "GIT_INDEX_FILE"):
+        monkeypatch.delenv(name, raising=False)
+    work, bare = tmp_path / "work", tmp_path / "bare.git"
+    git(tmp_path, "init", "-q", str(work))
+    git(work, "config", "user.name", "Test")
+    git(work, "config", "user.email", "test@example.com")
+    (work / "app.py").write_text("print('ok')\n")
+    git(work, "add", ".")
+    git(work, "commit", "-q", "-m", "feat: add app")
+    git(tmp_path, "clone", "-q", "--bare", str(work), str(bare))
+
+    path = tmp_path / "hook.sock"
+    requests = []
+    server = HookServer(str(path), idle_timeout=30)
+    handle = server.handle
+
+    def recording_handle(request):
+        requests.append(request)
+        return handle(request)
+
+    monkeypatch.setattr(server, "handle", recording_handle)
+    listener = server.bind()
+    thread = threading.Thread(target=server.serve, args=(listener,), daemon=True)
+    thread.start()
+    hook = bare / "hooks" / "pre-receive"
+    hook.write_text(
+        f"#!/bin/sh\n{SOCKET_ENV}={path} exec {sys.executable} {SCRIPT} "
+        "gate --no-cache --pre-receive\n"
+    )
+    hook.chmod(0o755)
+
+    (work / "merge.txt").write_text("<<<<<<< HEAD\n=======\n>>>>>>> x\n")
+    git(work, "add", ".")
+    git(work, "commit", "-q", "-m", "fix: merge")
+    pushed = git(work, "push", "-q", str(bare), "HEAD:master", check=False)
+    assert pushed.returncode != 0
+    assert "conflict" in pushed.stderr.lower()
+    assert len(requests) == 1 and requests[0]["stdin"]
+
+    assert send_request(str(path), {"tool": "stop"}) is not None
+    thread.join(timeout=5)
+
+
+def test_server_and_fallback_forward_binary_stdin(tmp_path, monkeypatch, capsys):
+    messages = b"feat: add parser\0fix: handle empty cursor.\0"
+    path = tmp_path / "hook.sock"
+    monkeypatch.setenv(SOCKET_ENV, str(path))
+    thread = start_server(path)
+
+    def run_validate():
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(messages)))
+        status = main(["validate", "--messages", "-"])
+        return status, capsys.readouterr().out.splitlines()[-1]
+
+    assert run_validate() == (
+        1,
+        "[INVALID] 2 messages checked: 1 invalid, 0 with style suggestions only.",
+    )
+    assert send_request(str(path), {"tool": "stop"}) is not None
+    thread.join(timeout=5)
+
+    # A stale socket gets no reply; the in-process fallback reads the same bytes.
+    path.write_text("")
+    assert run_validate()[0] == 1
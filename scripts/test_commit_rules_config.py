@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Unit tests for commit_rules_config.py."""
+
+import os
+import subprocess
+
+import commit_rules_config
+import precommit_safety_gate as gate
+import pytest
+import validate_conventional_commit as validator
+from commit_rules_config import (
+    BUNDLE_FILE_NAME,
+    RuleConfigError,
+    backtracking_risk,
+    load_rule_config,
+)
+
+try:
+    import tomllib  # noqa: F401
+except ImportError:
+    pytest.importorskip("tomli")
+
+CONFIG = """\
+extend-allowed-types = ["deps"]
+protected-branches = ['^trunk$']
+extend-sensitive-paths = ['(^|/)vault\\.json$']
+extend-content-rules = [
+    {name = "slack_token", pattern = 'xox[abp]-[0-9a-z-]+', literals = ["XOX"]},
+]
+"""
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    monkeypatch.delenv(commit_rules_config.CONFIG_ENV, raising=False)
+    yield tmp_path
+    gate.apply_rule_config({})
+
+
+def test_config_is_validated_once_and_reused_from_bundle(repo, monkeypatch):
+    (repo / ".commit-batcher.toml").write_text(CONFIG)
+    rules = load_rule_config()
+    assert rules["allowed-types"] == {"replace": None, "extend": ["deps"]}
+    assert rules["content-rules"]["extend"] == [
+        ["slack_token", "xox[abp]-[0-9a-z-]+", ["xox"]]
+    ]
+    assert (repo / ".git" / BUNDLE_FILE_NAME).exists()
+
+    def fail(*_args):
+        raise AssertionError("config was parsed again")
+
+    monkeypatch.setattr(commit_rules_config, "read_rules", fail)
+    assert load_rule_config() == rules
+
+    # A touched but unchanged file is recognized by its hash.
+    stat = os.stat(repo / ".commit-batcher.toml")
+    os.utime(repo / ".commit-batcher.toml", ns=(stat.st_atime_ns, 1))
+    assert load_rule_config() == rules
+
+
+def test_edited_config_invalidates_bundle(repo):
+    (repo / "pyproject.toml").write_text(
+        '[tool.commit-batcher]\nallowed-types = ["feat"]\n'
+    )
+    assert load_rule_config()["allowed-types"]["replace"] == ["feat"]
+
+    (repo / "pyproject.toml").write_text(
+        '[tool.commit-batcher]\nallowed-types = ["feat", "fix"]\n'
+    )
+    assert load_rule_config()["allowed-types"]["replace"] == ["feat", "fix"]
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("extend-sensitive-paths = ['(unclosed']", "invalid pattern"),
+        ("allowed-types = ['Feat']", "invalid commit type"),
+        ("sensitive-path = []", "unknown setting"),
+        ("content-rules = [{pattern = 'x'}]", "rule without a name"),
+        ("local-artifacts = ['(\\w+\\s?)*$']", "backtrack catastrophically"),
+        ("local-artifacts = ['((a+))+b']", "repeats a repeated group"),
+        ("local-artifacts = ['(?:(?:\\w+))*x']", "repeats a repeated group"),
+        ("local-artifacts = ['(a|aa)+$']", "repeats overlapping alternatives"),
+        ("local-artifacts = ['(a+){2,99}']", "repeats a repeated group"),
+        ("content-rules = [{name = 'x', pattern = '\\u00e9'}]", "raw diff bytes"),
+    ],
+)
+def test_invalid_config_is_reported(repo, capsys, text, message):
+    (repo / ".commit-batcher.toml").write_text(text + "\n")
+    with pytest.raises(RuleConfigError, match=message):
+        load_rule_config()
+
+    assert gate.main([]) == 1
+    assert "invalid rule config" in capsys.readouterr().err
+    assert validator.main(["feat: add thing"]) == 2
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r'"(?:[^"\\]|\\.)*"',
+        r"\d+(?:\.\d+){0,3}",
+        r"(?:\s|,)+",
+        r"(a{2})+",
+    ],
+)
+def test_unambiguous_repeats_are_accepted(pattern):
+    assert backtracking_risk(pattern) is None
+
+
+def test_gate_applies_repo_rules(repo):
+    (repo / ".commit-batcher.toml").write_text(CONFIG)
+    gate.apply_rule_config(load_rule_config())
+
+    assert gate.PROTECTED_BRANCH_RE.search("trunk")
+    assert not gate.PROTECTED_BRANCH_RE.search("main")
+    assert gate.matches_any("config/vault.json", gate.SENSITIVE_PATH_PATTERNS)
+    assert gate.matches_any("deploy/.env", gate.SENSITIVE_PATH_PATTERNS)
+    assert gate.classify_paths(["config/vault.json"])["sensitive_paths"] == [
+        "config/vault.json"
+    ]
+    assert gate.SENSITIVE_CONTENT_SCANNER.match("token: xoxb-1234-abcd") == (
+        "slack_token"
+    )
+    assert gate.SENSITIVE_CONTENT_SCANNER.match("api_key = 1") == "api_key"
+
+    defaults = gate.DEFAULT_RULES
+    gate.apply_rule_config({})
+    assert gate.PROTECTED_BRANCH_RE is defaults[0]
+    assert gate.SENSITIVE_CONTENT_SCANNER is defaults[-1]
+
+
+def test_validator_accepts_configured_types(repo, capsys):
+    assert validator.main(["deps: bump requests"]) == 1
+    (repo / ".commit-batcher.toml").write_text(CONFIG)
+    assert validator.main(["deps: bump requests"]) == 0
+    assert "[OK]" in capsys.readouterr().out
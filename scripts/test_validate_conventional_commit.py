@@ -1,9 +1,20 @@
 #!/usr/bin/env python3
 """Unit tests for validate_conventional_commit.py."""
 
+import json
+import subprocess
+
 import pytest
 
-from validate_conventional_commit import validate
+from validate_conventional_commit import (
+    RECORD_BATCH_SIZE,
+    Trailer,
+    Validator,
+    main,
+    parse_message,
+    validate,
+    validate_records,
+)
 
 # --- Defaults shared across tests ---
 DEFAULTS = dict(
@@ -219,3 +230,187 @@ def test_header_trailing_space_is_invalid():
     assert any(
         "header must not contain leading/trailing spaces" in e.lower() for e in errors
     )
+
+
+def test_validator_is_reusable_across_messages():
+    validator = Validator(allow_underscore_scope=False, allowed_types=("feat", "deps"))
+    assert validator.validate("deps(ui_kit): bump react")[0] != []
+    assert validator.validate("deps(ui-kit): bump react") == ([], [])
+    assert validator.validate("fix: handle cursor")[0] != []
+    for message in ("feat: Added parser", "feat: add parser\n\nBREAKING CHANGE: x"):
+        assert validator.validate(message) == validate(
+            message,
+            **{**DEFAULTS, "allow_underscore_scope": False},
+            allowed_types=("feat", "deps"),
+        )
+
+
+# ---- Structured parsing ----
+
+
+def test_parse_message_splits_header_body_and_trailers():
+    parsed = parse_message(
+        "feat(api)!: drop v1\n\nWhy it goes.\n\nMore.\n\n"
+        "Refs: #12\nBREAKING CHANGE: v1 is gone\n  use v2\n"
+    )
+    assert (parsed.type, parsed.scope, parsed.subject) == ("feat", "api", "drop v1")
+    assert parsed.breaking_bang and parsed.breaking and parsed.footer_valid
+    assert parsed.body == "Why it goes.\n\nMore."
+    assert parsed.trailers == [
+        Trailer("Refs", "#12", 6),
+        Trailer("BREAKING CHANGE", "v1 is gone\nuse v2", 7),
+    ]
+    assert [trailer.breaking for trailer in parsed.trailers] == [False, True]
+    assert not hasattr(parsed.trailers[0], "trailers")
+
+    parsed = parse_message("Fixed things\n\nNotes: a\nplain line")
+    assert parsed.type is None and parsed.subject is None
+    assert parsed.footer_start is None and parsed.trailers == []
+    assert parsed.body == "Notes: a\nplain line"
+
+
+def test_footer_detection_is_linear_on_long_blank_runs():
+    # Each blank line used to rescan the rest of the run.
+    message = "feat: x\n\nRefs: #1\nplain\n" + "\n" * 100_000 + "Refs: #2\nend"
+    errors, _ = validate(message, **DEFAULTS)
+    assert errors == ["Footer section contains invalid non-footer lines."]
+    assert parse_message(message).trailers == [Trailer("Refs", "#2", 100_004)]
+
+
+# ---- Bulk mode ----
+
+
+def git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+def test_range_validates_history_in_one_process(tmp_path, monkeypatch, capsys):
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "config", "user.name", "Test")
+    git(tmp_path, "config", "user.email", "test@example.com")
+    messages = [
+        "feat: add parser",
+        "Fixed the parser.",
+        "fix(api): handle empty cursor\n\nBody text on\ntwo lines.",
+        "docs: Updated readme",
+    ]
+    for message in messages:
+        git(tmp_path, "commit", "-q", "--allow-empty", "-m", message)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("GIT_DIR", raising=False)
+
+    report_path = tmp_path / "report.json"
+    assert main(["--range", "HEAD", "--report", str(report_path)]) == 1
+    output = capsys.readouterr().out
+    assert "[INVALID]" in output and "Fixed the parser." in output
+    assert output.splitlines()[-1] == (
+        "[INVALID] 4 messages checked: 1 invalid, 1 with style suggestions only."
+    )
+    report = json.loads(report_path.read_text())
+    assert (report["checked"], report["invalid"], report["warned"]) == (4, 1, 1)
+    assert [item["subject"] for item in report["messages"]] == [
+        "docs: Updated readme",
+        "Fixed the parser.",
+    ]
+    assert len(report["messages"][0]["id"]) == 40
+
+    assert main(["--range", "HEAD~1..HEAD"]) == 0
+    assert main(["--range", "no-such-rev"]) == 2
+    capsys.readouterr()
+
+    # The same messages from a NUL-separated file, over a process pool.
+    (tmp_path / "messages").write_bytes(
+        b"".join(message.encode() + b"\0" for message in messages)
+    )
+    assert main(["--messages", "messages", "--jobs", "2", "--report", "r.json"]) == 1
+    report = json.loads((tmp_path / "r.json").read_text())
+    assert [item["id"] for item in report["messages"]] == ["2", "4"]
+
+
+def test_pooled_validation_reads_records_in_bounded_batches():
+    consumed = []
+
+    def records():
+        for index in range(20 * RECORD_BATCH_SIZE):
+            consumed.append(index)
+            yield str(index), "feat: add thing" if index % 3 else "Added thing"
+
+    results = validate_records(records(), Validator(**DEFAULTS), jobs=2)
+    first = next(results)
+    assert first[0] == "0" and first[2]
+    assert len(consumed) <= 6 * RECORD_BATCH_SIZE
+    rest = list(results)
+    assert [result[0] for result in rest] == [str(i) for i in range(1, len(consumed))]
+    assert len(consumed) == 20 * RECORD_BATCH_SIZE
+
+
+def test_incremental_range_skips_validated_history(tmp_path, monkeypatch, capsys):
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "config", "user.name", "Test")
+    git(tmp_path, "config", "user.email", "test@example.com")
+    for message in ("feat: add parser", "fix: handle empty cursor"):
+        git(tmp_path, "commit", "-q", "--allow-empty", "-m", message)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("GIT_DIR", raising=False)
+
+    def checked(*extra):
+        status = main(["--range", "HEAD", "--incremental", *extra])
+        return status, capsys.readouterr().out.splitlines()[-1]
+
+    assert checked() == (
+        0,
+        "[OK] 2 messages checked: 0 invalid, 0 with style suggestions only.",
+    )
+    assert checked()[1].startswith("[OK] 0 messages checked")
+
+    # A failing run records nothing, so it keeps failing until fixed.
+    git(tmp_path, "commit", "-q", "--allow-empty", "-m", "Fixed the parser.")
+    assert checked()[0] == 1
+    assert checked()[1].startswith("[INVALID] 1 messages checked")
+
+    # Different settings do not reuse the checkpoints.
+    assert checked("--strict-scope")[1].startswith("[INVALID] 3 messages checked")
+
+    # Rewriting history leaves the old tip unreachable; prune drops it.
+    git(tmp_path, "commit", "-q", "--amend", "--allow-empty", "-m", "fix: parser")
+    assert checked()[1].startswith("[OK] 1 messages checked")
+    git(tmp_path, "reset", "-q", "--hard", "HEAD~1")
+    assert main(["--prune-checkpoints"]) == 0
+    assert capsys.readouterr().out.strip() == "[OK] Pruned 1 checkpoint(s); 1 kept."
+
+    with pytest.raises(SystemExit):
+        main(["--incremental", "feat: add parser"])
+
+
+def test_incremental_narrow_range_does_not_cover_older_history(
+    tmp_path, monkeypatch, capsys
+):
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "config", "user.name", "Test")
+    git(tmp_path, "config", "user.email", "test@example.com")
+    for message in (
+        "feat: add parser",
+        "bad message here",
+        "fix: handle empty cursor",
+        "docs: describe parser",
+        "test: cover parser",
+    ):
+        git(tmp_path, "commit", "-q", "--allow-empty", "-m", message)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("GIT_DIR", raising=False)
+
+    def checked(revisions):
+        status = main(["--range", revisions, "--incremental"])
+        return status, capsys.readouterr().out.splitlines()[-1]
+
+    assert checked("HEAD~2..HEAD")[0] == 0
+    # The wider range still reaches the bad commit below the first range,
+    # but does not check the two commits validated already.
+    status, summary = checked("HEAD")
+    assert status == 1
+    assert summary.startswith("[INVALID] 3 messages checked: 1 invalid")
+
+    # A range whose bounds hide the recorded ones reuses the tip.
+    assert checked("HEAD~1..HEAD")[1].startswith("[OK] 0 messages checked")
+    assert checked("HEAD~3..HEAD")[1].startswith("[OK] 1 messages checked")
+    assert checked("HEAD~3..HEAD")[1].startswith("[OK] 0 messages checked")
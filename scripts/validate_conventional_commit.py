@@ -3,11 +3,19 @@
 
 from __future__ import annotations
 
-import argparse
+import os
 import re
 import sys
-from pathlib import Path
-from typing import Sequence
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import argparse
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+    from concurrent.futures import Future
+    from pathlib import Path
+    from typing import Any, BinaryIO
+
+    Result = tuple[str, str, list[str], list[str]]
 
 ALLOWED_TYPES = (
     "feat",
@@ -28,18 +36,29 @@ NON_IMPERATIVE_START_RE = re.compile(
     re.IGNORECASE,
 )
 BREAKING_FOOTER_RE = re.compile(r"^BREAKING CHANGE:\s+\S")
-GENERIC_FOOTER_RE = re.compile(r"^[A-Za-z-]+:\s+\S")
+# A "BREAKING CHANGE:" footer or a generic "Token: value" footer.
+FOOTER_RE = re.compile(r"^(?:BREAKING CHANGE|[A-Za-z-]+):\s+\S")
 BREAKING_CHANGE_RE = re.compile(r"\bbreaking\s+changes?\b", re.IGNORECASE)
 
+# Bump when a check changes so existing history checkpoints stop applying.
+CHECKPOINT_FORMAT = 2
+CHECKPOINT_FILE_NAME = "conventional-commit-checkpoints.json"
+
+# Records per pool task. Messages are small, so batching keeps pickling and
+# task hand-off from dominating.
+RECORD_BATCH_SIZE = 256
+
 
-def build_header_re(allow_underscore_scope: bool) -> re.Pattern[str]:
+def build_header_re(
+    allow_underscore_scope: bool, allowed_types: Sequence[str] = ALLOWED_TYPES
+) -> re.Pattern[str]:
     scope_tail_chars = r"a-z0-9\-./_"
     if not allow_underscore_scope:
         scope_tail_chars = r"a-z0-9\-./"
 
     scope_pattern = rf"[a-z0-9][{scope_tail_chars}]*"
     return re.compile(
-        rf"^(?P<type>{'|'.join(ALLOWED_TYPES)})"
+        rf"^(?P<type>{'|'.join(allowed_types)})"
         rf"(?:\((?P<scope>{scope_pattern})\))?"
         rf"(?P<breaking>!)?"
         rf": "
@@ -47,7 +66,9 @@ def build_header_re(allow_underscore_scope: bool) -> re.Pattern[str]:
     )
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Validate a Conventional Commit message."
     )
@@ -62,6 +83,42 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Read commit message from standard input.",
     )
+    bulk = parser.add_mutually_exclusive_group()
+    bulk.add_argument(
+        "--range",
+        metavar="REVS",
+        help="Validate the message of every non-merge commit in a revision "
+        "range such as origin/main..HEAD, in one process.",
+    )
+    bulk.add_argument(
+        "--messages",
+        metavar="FILE",
+        help="Validate NUL-separated messages read from FILE ('-' for stdin).",
+    )
+    bulk.add_argument(
+        "--prune-checkpoints",
+        action="store_true",
+        help="Drop --incremental checkpoints whose commits are gone or no "
+        "longer reachable from any ref (after a rebase or force-push), then exit.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="With --range, skip commits already validated by an earlier clean "
+        "run with the same settings, and record this run's tips when it is clean.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for --range/--messages; 0 uses all CPUs (default: 1).",
+    )
+    parser.add_argument(
+        "--report",
+        metavar="FILE",
+        help="With --range/--messages, also write a JSON report of every "
+        "message with errors or warnings to FILE.",
+    )
     parser.add_argument(
         "--max-subject-length",
         type=int,
@@ -91,7 +148,10 @@ def parse_args() -> argparse.Namespace:
         default="warn",
         help="Flag non-imperative leading verbs (added/adding/fixed/fixing...).",
     )
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.incremental and not args.range:
+        parser.error("--incremental requires --range")
+    return args
 
 
 def read_message(args: argparse.Namespace) -> str:
@@ -99,7 +159,8 @@ def read_message(args: argparse.Namespace) -> str:
         return args.message.strip("\n")
 
     if args.file:
-        return Path(args.file).read_text(encoding="utf-8").strip("\n")
+        with open(args.file, encoding="utf-8") as handle:
+            return handle.read().strip("\n")
 
     if args.stdin:
         return sys.stdin.read().strip("\n")
@@ -108,19 +169,196 @@ def read_message(args: argparse.Namespace) -> str:
 
 
 def is_footer_line(line: str) -> bool:
-    return bool(BREAKING_FOOTER_RE.match(line) or GENERIC_FOOTER_RE.match(line))
+    return FOOTER_RE.match(line) is not None
+
+
+def is_footer_continuation(line: str) -> bool:
+    """True for lines a footer section may hold besides trailers."""
+    return not line.strip() or line.startswith((" ", "\t"))
+
+
+class Trailer:
+    """One ``Token: value`` footer; ``line`` is its index in the message lines.
+
+    Indented lines that follow a trailer are folded into ``value``, one per
+    line.
+    """
+
+    __slots__ = ("line", "token", "value")
 
+    def __init__(self, token: str, value: str, line: int) -> None:
+        self.token = token
+        self.value = value
+        self.line = line
 
-def is_valid_footer_section(lines: Sequence[str]) -> bool:
-    for line in lines:
+    @property
+    def breaking(self) -> bool:
+        return self.token == "BREAKING CHANGE"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Trailer):
+            return NotImplemented
+        return (self.token, self.value, self.line) == (
+            other.token,
+            other.value,
+            other.line,
+        )
+
+    def __repr__(self) -> str:
+        return f"Trailer({self.token!r}, {self.value!r}, {self.line})"
+
+
+class CommitMessage:
+    """A commit message split into header fields, body span and trailers.
+
+    ``type``, ``scope`` and ``subject`` are ``None`` when the header does not
+    match the header pattern. ``body_span`` is a half-open range of indexes
+    into ``lines`` with the surrounding blank lines trimmed. ``footer_start``
+    is the index of the first trailer, or ``None`` without a footer, and
+    ``footer_valid`` is false when the footer section also holds lines that
+    are neither trailers, indented continuations nor blank.
+    ``breaking_footer`` records a ``BREAKING CHANGE:`` line anywhere after
+    the header, which is what the validator accepts as the footer marker.
+    """
+
+    __slots__ = (
+        "_trailers",
+        "body_span",
+        "breaking_bang",
+        "breaking_footer",
+        "footer_start",
+        "footer_valid",
+        "lines",
+        "scope",
+        "subject",
+        "type",
+    )
+
+    def __init__(
+        self,
+        lines: list[str],
+        header_match: re.Match[str] | None,
+        body_span: tuple[int, int],
+        footer_start: int | None,
+        footer_valid: bool,
+        breaking_footer: bool,
+    ) -> None:
+        self.lines = lines
+        self.type: str | None = None
+        self.scope: str | None = None
+        self.subject: str | None = None
+        self.breaking_bang = False
+        if header_match is not None:
+            self.type, self.scope, self.subject, bang = header_match.group(
+                "type", "scope", "subject", "breaking"
+            )
+            self.breaking_bang = bool(bang)
+        self.body_span = body_span
+        self.footer_start = footer_start
+        self.footer_valid = footer_valid
+        self.breaking_footer = breaking_footer
+        self._trailers: list[Trailer] | None = None
+
+    @property
+    def header(self) -> str:
+        return self.lines[0] if self.lines else ""
+
+    @property
+    def body(self) -> str:
+        start, end = self.body_span
+        return "\n".join(self.lines[start:end])
+
+    @property
+    def trailers(self) -> list[Trailer]:
+        """Trailers of the footer section, parsed on first use."""
+        if self._trailers is None:
+            trailers: list[Trailer] = []
+            for index in range(self.footer_start or len(self.lines), len(self.lines)):
+                line = self.lines[index]
+                if is_footer_line(line):
+                    token, _, value = line.partition(":")
+                    trailers.append(Trailer(token, value.strip(), index))
+                elif trailers and line.strip() and line.startswith((" ", "\t")):
+                    trailers[-1].value += "\n" + line.strip()
+            self._trailers = trailers
+        return self._trailers
+
+    @property
+    def breaking(self) -> bool:
+        """True for a ``!`` header or a ``BREAKING CHANGE`` trailer."""
+        return self.breaking_bang or any(trailer.breaking for trailer in self.trailers)
+
+
+def parse_message(
+    message: str, header_re: re.Pattern[str] | None = None
+) -> CommitMessage:
+    """Split ``message`` into a ``CommitMessage`` in time linear in its length.
+
+    ``header_re`` defaults to the pattern for ``ALLOWED_TYPES`` with
+    underscores allowed in scopes; ``Validator.parse`` passes its own.
+
+    The footer starts at the first content line when that line is a trailer
+    and everything after it can belong to a footer. Otherwise it starts at
+    the first trailer that follows a blank line.
+    """
+    if header_re is None:
+        header_re = build_header_re(True)
+    lines = message.splitlines()
+    count = len(lines)
+    header_match = header_re.match(lines[0].strip()) if lines else None
+    breaking_footer = count > 1 and BREAKING_FOOTER_RE.match(lines[1]) is not None
+
+    first_text: int | None = None
+    after_blank: int | None = None
+    previous_blank = False
+    for index in range(2, count):
+        line = lines[index]
         if not line.strip():
+            previous_blank = True
             continue
-        if is_footer_line(line):
-            continue
-        if line.startswith((" ", "\t")):
-            continue
-        return False
-    return True
+        if line.startswith("BREAKING CHANGE:") and BREAKING_FOOTER_RE.match(line):
+            breaking_footer = True
+        if first_text is None:
+            first_text = index
+        elif previous_blank and after_blank is None and is_footer_line(line):
+            after_blank = index
+        previous_blank = False
+
+    # Lines after the last one that cannot sit in a footer form the longest
+    # valid footer tail; a backward walk finds it without rescanning.
+    footer_tail = count
+    while footer_tail > 2 and (
+        is_footer_continuation(lines[footer_tail - 1])
+        or is_footer_line(lines[footer_tail - 1])
+    ):
+        footer_tail -= 1
+
+    footer_start = after_blank
+    if (
+        first_text is not None
+        and is_footer_line(lines[first_text])
+        and (
+            first_text >= footer_tail
+            or (first_text > 2 and not lines[first_text - 1].strip())
+        )
+    ):
+        footer_start = first_text
+
+    start = min(2, count)
+    end = count if footer_start is None else footer_start
+    while start < end and not lines[start].strip():
+        start += 1
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+
+    return CommitMessage(
+        lines,
+        header_match,
+        (start, end),
+        footer_start,
+        footer_start is None or footer_start >= footer_tail,
+        breaking_footer,
+    )
 
 
 def first_alpha_char(value: str) -> str | None:
@@ -139,6 +377,139 @@ def add_style_message(
         warnings.append(message)
 
 
+class Validator:
+    """Conventional Commit checks configured once and reused across messages.
+
+    The header pattern is compiled when the validator is built, so callers
+    checking many messages (history audits, server hooks) pay for it once.
+    """
+
+    def __init__(
+        self,
+        max_subject_length: int = 72,
+        max_header_length: int = 100,
+        allow_underscore_scope: bool = True,
+        subject_lowercase_mode: str = "warn",
+        imperative_mode: str = "warn",
+        allowed_types: Sequence[str] = ALLOWED_TYPES,
+    ) -> None:
+        self.max_subject_length = max_subject_length
+        self.max_header_length = max_header_length
+        self.allow_underscore_scope = allow_underscore_scope
+        self.subject_lowercase_mode = subject_lowercase_mode
+        self.imperative_mode = imperative_mode
+        self.allowed_types = tuple(allowed_types)
+        self.header_re = build_header_re(allow_underscore_scope, self.allowed_types)
+
+    def fingerprint(self) -> str:
+        """Hash of every setting that affects results; keys history checkpoints."""
+        import hashlib
+
+        settings = (
+            CHECKPOINT_FORMAT,
+            self.max_subject_length,
+            self.max_header_length,
+            self.allow_underscore_scope,
+            self.subject_lowercase_mode,
+            self.imperative_mode,
+            self.allowed_types,
+        )
+        return hashlib.sha256(repr(settings).encode()).hexdigest()[:16]
+
+    def parse(self, message: str) -> CommitMessage:
+        """Parse ``message`` with this validator's header pattern."""
+        return parse_message(message, self.header_re)
+
+    def validate(self, message: str) -> tuple[list[str], list[str]]:
+        """Return ``(errors, warnings)`` for one commit message."""
+        errors: list[str] = []
+        warnings: list[str] = []
+
+        parsed = self.parse(message)
+        lines = parsed.lines
+        if not lines:
+            return (["Message is empty."], warnings)
+
+        header = lines[0]
+        header_for_match = header.strip()
+        if header != header_for_match:
+            errors.append("Header must not contain leading/trailing spaces.")
+
+        commit_type = parsed.type
+        subject = parsed.subject
+        if commit_type is None or subject is None:
+            return (
+                [
+                    "Header must match '<type>(<scope>)!: <subject>' using allowed Conventional Commit types."
+                ],
+                warnings,
+            )
+
+        if commit_type not in self.allowed_types:
+            errors.append(f"Type '{commit_type}' is not allowed.")
+
+        if len(header_for_match) > self.max_header_length:
+            errors.append(
+                f"Header length {len(header_for_match)} exceeds max {self.max_header_length}."
+            )
+
+        if subject.endswith("."):
+            errors.append("Subject must not end with a period.")
+
+        if len(subject) > self.max_subject_length:
+            errors.append(
+                f"Subject length {len(subject)} exceeds max {self.max_subject_length}."
+            )
+
+        if subject != subject.strip():
+            errors.append("Subject must not contain leading/trailing spaces.")
+
+        if "  " in subject:
+            errors.append("Subject must not contain consecutive spaces.")
+
+        first_alpha = first_alpha_char(subject)
+        if first_alpha and first_alpha.isupper():
+            add_style_message(
+                self.subject_lowercase_mode,
+                "Subject should start with lowercase when the first letter is alphabetic.",
+                errors,
+                warnings,
+            )
+
+        if NON_IMPERATIVE_START_RE.match(subject.strip()):
+            add_style_message(
+                self.imperative_mode,
+                "Subject should use imperative mood (for example 'add' instead of 'added/adding').",
+                errors,
+                warnings,
+            )
+
+        has_extra_content = len(lines) > 1
+        if has_extra_content:
+            if lines[1].strip():
+                errors.append(
+                    "If body or footer exists, insert exactly one blank line after header."
+                )
+            elif len(lines) > 2 and not lines[2].strip():
+                errors.append(
+                    "If body or footer exists, insert exactly one blank line after header."
+                )
+
+        if not parsed.footer_valid:
+            errors.append("Footer section contains invalid non-footer lines.")
+
+        if (
+            not parsed.breaking_bang
+            and not parsed.breaking_footer
+            and BREAKING_CHANGE_RE.search(message)
+        ):
+            errors.append(
+                "Message mentions breaking changes; add '!' in header or 'BREAKING CHANGE:' footer."
+            )
+
+        return errors, warnings
+
+
 def validate(
     message: str,
     max_subject_length: int,
@@ -146,157 +517,479 @@ def validate(
     allow_underscore_scope: bool,
     subject_lowercase_mode: str,
     imperative_mode: str,
+    allowed_types: Sequence[str] = ALLOWED_TYPES,
 ) -> tuple[list[str], list[str]]:
-    errors: list[str] = []
-    warnings: list[str] = []
+    """Validate one message; build a ``Validator`` once to check many."""
+    return Validator(
+        max_subject_length,
+        max_header_length,
+        allow_underscore_scope,
+        subject_lowercase_mode,
+        imperative_mode,
+        allowed_types,
+    ).validate(message)
+
+
+def load_allowed_types() -> tuple[str, ...]:
+    """Return ALLOWED_TYPES with the repository rule config applied, if any."""
+    try:
+        from commit_rules_config import apply_table, load_rule_config
+    except ImportError:  # script copied on its own
+        return ALLOWED_TYPES
+    return apply_table(ALLOWED_TYPES, load_rule_config(), "allowed-types", str)
 
-    lines = message.splitlines()
-    if not lines:
-        return (["Message is empty."], warnings)
-
-    header = lines[0]
-    header_for_match = header.strip()
-    if header != header_for_match:
-        errors.append("Header must not contain leading/trailing spaces.")
-
-    header_re = build_header_re(allow_underscore_scope)
-    match = header_re.match(header_for_match)
-    if not match:
-        return (
-            [
-                "Header must match '<type>(<scope>)!: <subject>' using allowed Conventional Commit types."
-            ],
-            warnings,
-        )
 
-    commit_type = match.group("type")
-    subject = match.group("subject")
-    has_breaking_bang = bool(match.group("breaking"))
+def print_items(prefix: str, items: Sequence[str]) -> None:
+    print(prefix)
+    for item in items:
+        print(f"- {item}")
 
-    if commit_type not in ALLOWED_TYPES:
-        errors.append(f"Type '{commit_type}' is not allowed.")
 
-    if len(header_for_match) > max_header_length:
-        errors.append(
-            f"Header length {len(header_for_match)} exceeds max {max_header_length}."
-        )
+def iter_nul_records(stream: BinaryIO, chunk_size: int = 1 << 16) -> Iterator[bytes]:
+    """Yield NUL-terminated records from ``stream`` as they are read."""
+    pending = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        *records, pending = (pending + chunk).split(b"\0")
+        yield from records
+    if pending.strip():
+        yield pending
 
-    if subject.endswith("."):
-        errors.append("Subject must not end with a period.")
 
-    if len(subject) > max_subject_length:
-        errors.append(
-            f"Subject length {len(subject)} exceeds max {max_subject_length}."
-        )
+def decode_message(record: bytes) -> str:
+    return record.decode("utf-8", errors="replace").strip("\n")
 
-    if subject != subject.strip():
-        errors.append("Subject must not contain leading/trailing spaces.")
 
-    if "  " in subject:
-        errors.append("Subject must not contain consecutive spaces.")
+def iter_log_messages(
+    revisions: Sequence[str], exclude: Sequence[str] = ()
+) -> Iterator[tuple[str, str]]:
+    """Stream ``(sha, message)`` for the non-merge commits in ``revisions``.
 
-    first_alpha = first_alpha_char(subject)
-    if first_alpha and first_alpha.isupper():
-        add_style_message(
-            subject_lowercase_mode,
-            "Subject should start with lowercase when the first letter is alphabetic.",
-            errors,
-            warnings,
-        )
+    Commits reachable from any of ``exclude`` are left out.
+    """
+    import subprocess
 
-    if NON_IMPERATIVE_START_RE.match(subject.strip()):
-        add_style_message(
-            imperative_mode,
-            "Subject should use imperative mood (for example 'add' instead of 'added/adding').",
-            errors,
-            warnings,
-        )
+    args = ["git", "log", "--no-merges", "--format=%H%x00%B%x00", *revisions]
+    if exclude:
+        args += ["--not", *exclude]
+    process = subprocess.Popen(
+        [*args, "--"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    assert process.stdout is not None and process.stderr is not None
+    try:
+        records = iter_nul_records(process.stdout)
+        for sha in records:
+            # Each entry after the first starts with git log's record newline.
+            sha = sha.strip()
+            if sha:
+                yield sha.decode("ascii"), decode_message(next(records, b""))
+    finally:
+        process.stdout.close()
+        stderr = process.stderr.read().decode(errors="replace").strip()
+        process.stderr.close()
+        returncode = process.wait()
+    if returncode != 0:
+        raise ValueError(f"git log {' '.join(revisions)} failed: {stderr}")
+
+
+def iter_file_messages(source: str) -> Iterator[tuple[str, str]]:
+    """Stream ``(index, message)`` for NUL-separated messages; indexes start at 1."""
+    from contextlib import nullcontext
+
+    with (
+        nullcontext(sys.stdin.buffer) if source == "-" else open(source, "rb")
+    ) as handle:
+        for index, record in enumerate(iter_nul_records(handle), start=1):
+            yield str(index), decode_message(record)
+
+
+def check_record(validator: Validator, record: tuple[str, str]) -> Result:
+    """Validate one ``(id, message)`` record; the unit of work for bulk mode."""
+    errors, warnings = validator.validate(record[1])
+    return record[0], record[1].partition("\n")[0], errors, warnings
+
+
+def check_batch(validator: Validator, batch: list[tuple[str, str]]) -> list[Result]:
+    """Validate a batch of records; the unit of work handed to a pool worker."""
+    return [check_record(validator, record) for record in batch]
+
+
+def validate_records(
+    records: Iterable[tuple[str, str]], validator: Validator, jobs: int = 1
+) -> Iterator[Result]:
+    """Validate records in order, in this process or over a pool of ``jobs``.
+
+    The pool is fed batches of ``RECORD_BATCH_SIZE`` records with at most
+    ``2 * jobs`` batches in flight, so a long history is never held in memory.
+    """
+    from functools import partial
+
+    if jobs <= 1:
+        yield from map(partial(check_record, validator), records)
+        return
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    from itertools import islice
+
+    iterator = iter(records)
+    pending: deque[Future[list[Result]]] = deque()
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        while batch := list(islice(iterator, RECORD_BATCH_SIZE)):
+            pending.append(executor.submit(check_batch, validator, batch))
+            if len(pending) > 2 * jobs:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
 
-    has_extra_content = len(lines) > 1
-    if has_extra_content:
-        if lines[1].strip():
-            errors.append(
-                "If body or footer exists, insert exactly one blank line after header."
-            )
-        elif len(lines) > 2 and not lines[2].strip():
-            errors.append(
-                "If body or footer exists, insert exactly one blank line after header."
-            )
 
-    content_lines = lines[2:] if len(lines) > 2 else []
-    first_footer_index: int | None = None
-    if content_lines:
-        first_non_empty_index: int | None = None
-        for index, line in enumerate(content_lines):
-            if line.strip():
-                first_non_empty_index = index
-                break
+def run_git(args: Sequence[str], input: str | None = None) -> str:
+    import subprocess
 
-        if (
-            first_non_empty_index is not None
-            and is_footer_line(content_lines[first_non_empty_index])
-            and is_valid_footer_section(content_lines[first_non_empty_index:])
-        ):
-            first_footer_index = first_non_empty_index
-        else:
-            for index, line in enumerate(content_lines):
-                if line.strip():
-                    continue
-                next_index = index + 1
-                while (
-                    next_index < len(content_lines)
-                    and not content_lines[next_index].strip()
-                ):
-                    next_index += 1
-                if next_index >= len(content_lines):
-                    break
-                if is_footer_line(content_lines[next_index]):
-                    first_footer_index = next_index
-                    break
-
-    if first_footer_index is not None:
-        body_lines = content_lines[:first_footer_index]
-        footer_lines = content_lines[first_footer_index:]
-
-        if body_lines and body_lines[-1].strip():
-            errors.append("Insert one blank line between body and footer.")
-
-        if not is_valid_footer_section(footer_lines):
-            errors.append("Footer section contains invalid non-footer lines.")
+    result = subprocess.run(
+        ["git", *args], text=True, capture_output=True, input=input, check=False
+    )
+    if result.returncode != 0:
+        raise ValueError(f"git {args[0]} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def existing_commits(shas: Sequence[str]) -> set[str]:
+    """Return the members of ``shas`` that are commits in the object store."""
+    if not shas:
+        return set()
+    output = run_git(
+        ["cat-file", "--batch-check=%(objectname) %(objecttype)"],
+        input="".join(f"{sha}\n" for sha in shas),
+    )
+    return {
+        line.split(" ", 1)[0]
+        for line in output.splitlines()
+        if line.endswith(" commit")
+    }
 
-    has_breaking_footer = any(BREAKING_FOOTER_RE.match(line) for line in lines[1:])
-    mentions_breaking_change = bool(BREAKING_CHANGE_RE.search(message))
-    if mentions_breaking_change and not (has_breaking_bang or has_breaking_footer):
-        errors.append(
-            "Message mentions breaking changes; add '!' in header or 'BREAKING CHANGE:' footer."
-        )
 
-    return errors, warnings
+def reachable_from_ref(sha: str) -> bool:
+    return bool(
+        run_git(["for-each-ref", "--count=1", "--format=%(refname)", "--contains", sha])
+    )
 
 
-def print_items(prefix: str, items: Sequence[str]) -> None:
-    print(prefix)
-    for item in items:
-        print(f"- {item}")
+class CheckpointStore:
+    """Commit ranges already validated clean, stored as JSON under ``.git/``.
+
+    ``configs`` maps a ``Validator.fingerprint()`` to the ranges of earlier
+    ``--range`` runs in which every commit passed, each a tip and the
+    negative bounds it was validated down to (none for whole history). A
+    later run with the same fingerprint excludes history reachable from a
+    tip only when its own bounds cover the recorded ones. The commits of
+    bounded runs are also kept, so a wider range can skip them one by one.
+    Changing any setting changes the fingerprint, so nothing recorded under
+    the old one applies. Every level keeps only the most recently used
+    entries.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_tips: int = 64,
+        max_commits: int = 20000,
+        max_configs: int = 8,
+    ) -> None:
+        self.path = path
+        self.max_tips = max_tips
+        self.max_commits = max_commits
+        self.max_configs = max_configs
+        self.configs: dict[str, dict[str, list[Any]]] = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path, **kwargs: Any) -> CheckpointStore:
+        import json
+
+        store = cls(path, **kwargs)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return store
+        if not isinstance(data, dict) or data.get("format") != CHECKPOINT_FORMAT:
+            return store
+        for key, entry in dict(data.get("configs", {})).items():
+            if not isinstance(entry, dict):
+                continue
+            store.configs[str(key)] = {
+                "ranges": [
+                    [str(tip), [str(sha) for sha in bounds]]
+                    for tip, bounds in entry.get("ranges", ())
+                ],
+                "commits": [str(sha) for sha in entry.get("commits", ())],
+            }
+        return store
+
+    def ranges(self, fingerprint: str) -> list[tuple[str, list[str]]]:
+        entry = self.configs.get(fingerprint, {})
+        return [(tip, list(bounds)) for tip, bounds in entry.get("ranges", ())]
+
+    def commits(self, fingerprint: str) -> set[str]:
+        return set(self.configs.get(fingerprint, {}).get("commits", ()))
+
+    def add(
+        self,
+        fingerprint: str,
+        tips: Sequence[str],
+        bounds: Sequence[str] = (),
+        commits: Sequence[str] = (),
+    ) -> None:
+        """Record ``tips`` as validated down to ``bounds``.
+
+        ``commits`` are the commits the run checked; they are only kept for
+        bounded runs, since a whole-history tip already covers them.
+        """
+        entry = self.configs.pop(fingerprint, {"ranges": [], "commits": []})
+        bounds = sorted(bounds)
+        ranges = [item for item in entry["ranges"] if item[0] not in tips]
+        entry["ranges"] = [*ranges, *([tip, bounds] for tip in tips)][-self.max_tips :]
+        if bounds and commits:
+            new = set(commits)
+            kept = [sha for sha in entry["commits"] if sha not in new]
+            entry["commits"] = [*kept, *commits][-self.max_commits :]
+        self.configs[fingerprint] = entry
+        self.dirty = True
+        while len(self.configs) > self.max_configs:
+            del self.configs[next(iter(self.configs))]
+
+    def prune(
+        self,
+        keep: Callable[[str], bool],
+        keep_commit: Callable[[str], bool] | None = None,
+    ) -> int:
+        """Drop every range whose tip or bounds fail ``keep``; return how many went.
+
+        Recorded commits are dropped when ``keep_commit`` (default ``keep``)
+        is false for them.
+        """
+        keep_commit = keep_commit or keep
+        removed = 0
+        for fingerprint, entry in list(self.configs.items()):
+            ranges = [
+                item
+                for item in entry["ranges"]
+                if keep(item[0]) and all(keep(sha) for sha in item[1])
+            ]
+            commits = [sha for sha in entry["commits"] if keep_commit(sha)]
+            removed += len(entry["ranges"]) - len(ranges)
+            if len(commits) != len(entry["commits"]):
+                self.dirty = True
+            if ranges or commits:
+                self.configs[fingerprint] = {"ranges": ranges, "commits": commits}
+            else:
+                del self.configs[fingerprint]
+        if removed:
+            self.dirty = True
+        return removed
+
+    def save(self) -> None:
+        if self.path is None or not self.dirty:
+            return
+        import json
+        import tempfile
+
+        payload = {"format": CHECKPOINT_FORMAT, "configs": self.configs}
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.path.parent, delete=False
+            ) as handle:
+                json.dump(payload, handle, separators=(",", ":"))
+            os.replace(handle.name, self.path)
+        except OSError:
+            return
+        self.dirty = False
+
+
+def checkpoint_store() -> CheckpointStore:
+    from pathlib import Path
+
+    return CheckpointStore.load(
+        Path(run_git(["rev-parse", "--git-path", CHECKPOINT_FILE_NAME]).strip())
+    )
 
 
-def main() -> int:
-    args = parse_args()
+def bounds_covered(recorded: Sequence[str], bounds: Sequence[str]) -> bool:
+    """Whether history below ``bounds`` includes everything below ``recorded``.
 
+    A checkpoint validated down to ``recorded`` may only exclude its tip
+    from a range whose own negative ``bounds`` hide at least as much.
+    """
+    if not recorded:
+        return True
+    if not bounds:
+        return False
+    return not run_git(["rev-list", "--max-count=1", *recorded, "--not", *bounds])
+
+
+def prune_checkpoints() -> int:
     try:
-        message = read_message(args)
-    except Exception as exc:  # pragma: no cover
+        store = checkpoint_store()
+        every_sha = sorted(
+            {
+                sha
+                for entry in store.configs.values()
+                for tip, bounds in entry["ranges"]
+                for sha in (tip, *bounds)
+            }
+            | {sha for entry in store.configs.values() for sha in entry["commits"]}
+        )
+        present = existing_commits(every_sha)
+        reachable: dict[str, bool] = {}
+
+        def keep(sha: str) -> bool:
+            if sha not in reachable:
+                reachable[sha] = sha in present and reachable_from_ref(sha)
+            return reachable[sha]
+
+        removed = store.prune(keep, lambda sha: sha in present)
+    except (OSError, ValueError) as exc:
         print(f"[ERROR] {exc}")
         return 2
+    store.save()
+    kept = sum(len(entry["ranges"]) for entry in store.configs.values())
+    print(f"[OK] Pruned {removed} checkpoint(s); {kept} kept.")
+    return 0
+
 
-    errors, warnings = validate(
-        message=message,
+def run_bulk(args: argparse.Namespace, validator: Validator) -> int:
+    store: CheckpointStore | None = None
+    tips: list[str] = []
+    bounds: list[str] = []
+    validated: list[str] = []
+    try:
+        if args.range and args.incremental:
+            store = checkpoint_store()
+            fingerprint = validator.fingerprint()
+            # Resolve the range up front so a tip that moves during the run
+            # is not recorded as validated.
+            revisions = run_git(["rev-parse", args.range]).split()
+            tips = [sha for sha in revisions if not sha.startswith("^")]
+            bounds = [sha[1:] for sha in revisions if sha.startswith("^")]
+            known = store.ranges(fingerprint)
+            present = existing_commits(
+                sorted({sha for tip, recorded in known for sha in (tip, *recorded)})
+            )
+            exclude = [
+                tip
+                for tip, recorded in known
+                if tip in present
+                and all(sha in present for sha in recorded)
+                and bounds_covered(recorded, bounds)
+            ]
+            if exclude:
+                print(
+                    f"[OK] Skipping history validated through {len(exclude)} checkpoint(s)."
+                )
+            records = iter_log_messages(revisions, exclude)
+            seen = store.commits(fingerprint)
+            if seen:
+                records = (record for record in records if record[0] not in seen)
+        elif args.range:
+            records = iter_log_messages([args.range])
+        else:
+            records = iter_file_messages(args.messages)
+    except (OSError, ValueError) as exc:
+        print(f"[ERROR] {exc}")
+        return 2
+    jobs = args.jobs or os.cpu_count() or 1
+    checked = 0
+    flagged: list[dict[str, Any]] = []
+    try:
+        for name, subject, errors, warnings in validate_records(
+            records, validator, jobs
+        ):
+            checked += 1
+            if store is not None and not errors:
+                validated.append(name)
+            if not (errors or warnings):
+                continue
+            flagged.append(
+                {
+                    "id": name,
+                    "subject": subject,
+                    "errors": errors,
+                    "warnings": warnings,
+                }
+            )
+            status = "[INVALID]" if errors else "[WARN]"
+            print_items(f"{status} {name[:12]} {subject}", [*errors, *warnings])
+    except (OSError, ValueError) as exc:
+        print(f"[ERROR] {exc}")
+        return 2
+
+    invalid = sum(1 for item in flagged if item["errors"])
+    warned = len(flagged) - invalid
+    print(
+        f"[{'INVALID' if invalid else 'OK'}] {checked} messages checked: "
+        f"{invalid} invalid, {warned} with style suggestions only."
+    )
+    if args.report:
+        import json
+
+        report = {
+            "checked": checked,
+            "invalid": invalid,
+            "warned": warned,
+            "messages": flagged,
+        }
+        try:
+            with open(args.report, "w", encoding="utf-8") as handle:
+                json.dump(report, handle, indent=2)
+                handle.write("\n")
+        except OSError as exc:
+            print(f"[ERROR] cannot write report: {exc}")
+            return 2
+    if store is not None and not invalid:
+        store.add(validator.fingerprint(), tips, bounds, validated)
+        store.save()
+    return 1 if invalid else 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.prune_checkpoints:
+        return prune_checkpoints()
+    bulk = bool(args.range or args.messages)
+
+    message = ""
+    if not bulk:
+        try:
+            message = read_message(args)
+        except Exception as exc:  # pragma: no cover
+            print(f"[ERROR] {exc}")
+            return 2
+
+    try:
+        allowed_types = load_allowed_types()
+    except ValueError as exc:
+        print(f"[ERROR] invalid rule config: {exc}")
+        return 2
+
+    validator = Validator(
         max_subject_length=args.max_subject_length,
         max_header_length=args.max_header_length,
         allow_underscore_scope=not args.strict_scope,
         subject_lowercase_mode=args.subject_lowercase_mode,
         imperative_mode=args.imperative_mode,
+        allowed_types=allowed_types,
     )
+    if bulk:
+        return run_bulk(args, validator)
+
+    errors, warnings = validator.validate(message)
     if errors:
         print_items("[INVALID] Conventional Commit check failed:", errors)
         if warnings: